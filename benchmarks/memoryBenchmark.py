@@ -0,0 +1,85 @@
+'''
+Measures the memory a node takes: as loaded data and once turned into a Node, both with the current sources
+and with those of a git revision, by default the one before the nodes were slotted.
+The graph is a ternary tree where every other node has an attribute.
+
+	python benchmarks/memoryBenchmark.py [nodes] [revision]
+'''
+from __future__ import annotations
+
+import io
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+SRC = ROOT / 'src'
+BEFORE_SLOTS = '13d8a98~1'
+RUN_MEASUREMENT = '''
+import gc, json, sys, tracemalloc
+from nodes import MemberTypes, NodesManager
+
+
+def create_data(count):
+	data = {}
+	for i in range(count):
+		node_data = {}
+		if i:
+			node_data[MemberTypes.PARENTS] = [f'node {(i - 1) // 3}']
+		children = [f'node {child}' for child in range(3 * i + 1, min(3 * i + 4, count))]
+		if children:
+			node_data[MemberTypes.CHILDREN] = children
+		if i % 2:
+			node_data['capital'] = f'capital {i}'
+		data[f'node {i}'] = node_data
+	return data
+
+
+def measure(create):
+	gc.collect()
+	before = tracemalloc.get_traced_memory()[0]
+	created = create()
+	gc.collect()
+	return created, tracemalloc.get_traced_memory()[0] - before
+
+
+count = int(sys.argv[1])
+tracemalloc.start()
+data, data_size = measure(lambda: create_data(count))
+NodesManager._data = data
+nodes, nodes_size = measure(lambda: list(map(NodesManager.get_node, data)))
+print(json.dumps({'data': data_size / count, 'Node': nodes_size / count}))
+'''
+
+
+def export_sources(revision: str, directory: Path) -> Path:
+	archive = subprocess.run(['git', '-C', str(ROOT), 'archive', revision, 'src'], check=True, capture_output=True).stdout
+	with tarfile.open(fileobj=io.BytesIO(archive)) as sources:
+		sources.extractall(directory)
+	return directory / 'src'
+
+
+def measure_run(src: Path, count: int) -> dict[str, float]:
+	'''
+	A fresh interpreter for each tree, so that neither one's modules nor allocations leak into the other
+	'''
+	env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, (str(src), os.environ.get('PYTHONPATH'))))}
+	finished = subprocess.run([sys.executable, '-c', RUN_MEASUREMENT, str(count)], env=env, check=True, capture_output=True, text=True)
+	return json.loads(finished.stdout)
+
+
+def main(count: int = 100_000, revision: str = BEFORE_SLOTS) -> None:
+	with tempfile.TemporaryDirectory() as directory:
+		layouts = {revision: measure_run(export_sources(revision, Path(directory)), count), 'current': measure_run(SRC, count)}
+	print(f'{count} nodes, bytes per node')
+	print(f'  {"":<12}{"data":>8}{"Node":>8}')
+	for name, sizes in layouts.items():
+		print(f'  {name:<12}{sizes["data"]:8.1f}{sizes["Node"]:8.1f}')
+
+
+if __name__ == '__main__':
+	main(*map(int, sys.argv[1:2]), *sys.argv[2:3])
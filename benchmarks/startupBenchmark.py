@@ -0,0 +1,75 @@
+'''
+Measures the cold start of single commands. Each run is a fresh interpreter that imports the CLI,
+loads a small database and parses one command, building the command tree lazily or all at once.
+
+	python benchmarks/startupBenchmark.py [runs]
+'''
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).parent.parent / 'src'
+COMMANDS = ('show', 'show Europe', 'search E', 'add Portugal --with_parents Europe')
+PHASES = ('import', 'load', 'parse', 'total')
+RUN_COMMAND = '''
+import json, sys, time
+start = time.perf_counter()
+from pathlib import Path
+from categorierCli import CategorierCli
+from nodes import NodesManager
+imported = time.perf_counter()
+NodesManager.load_data(Path(sys.argv[1]))
+loaded = time.perf_counter()
+cli = CategorierCli()
+cli.set_out_stream(lambda *args, **kwargs: None)
+if sys.argv[2] == 'eager':
+	cli.create_all_subtrees()
+cli.parse(['m', *sys.argv[3:]])
+parsed = time.perf_counter()
+print(json.dumps({'import': imported - start, 'load': loaded - imported, 'parse': parsed - loaded}))
+'''
+
+
+def create_database(directory: Path) -> Path:
+	path = directory / 'startup.yml'
+	lines = ['Europe:', '  children: [Poland, Spain]', 'Poland:', '  parents: [Europe]', 'Spain:', '  parents: [Europe]']
+	path.write_text('\n'.join(lines) + '\n')
+	return path
+
+
+def time_run(database: Path, mode: str, command: str) -> dict[str, float]:
+	env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, (str(SRC), os.environ.get('PYTHONPATH'))))}
+	start = time.perf_counter()
+	finished = subprocess.run([sys.executable, '-c', RUN_COMMAND, str(database), mode, *command.split()],
+							  env=env, check=True, capture_output=True, text=True)
+	timings = json.loads(finished.stdout)
+	timings['total'] = time.perf_counter() - start
+	return timings
+
+
+def format_timings(runs: list[dict[str, float]]) -> str:
+	return ' '.join(f'{phase} {statistics.median(run[phase] for run in runs) * 1000:6.1f}' for phase in PHASES)
+
+
+def main(runs: int = 10) -> None:
+	print(f'median ms of {runs} runs')
+	with tempfile.TemporaryDirectory() as directory:
+		for command in COMMANDS:
+			print(command)
+			for mode in ('eager', 'lazy'):
+				timings = []
+				for _ in range(runs):
+					database = create_database(Path(directory))  # a fresh copy, so adding never meets an existing node
+					timings.append(time_run(database, mode, command))
+				print(f'  {mode:<6}{format_timings(timings)}')
+
+
+if __name__ == '__main__':
+	main(*map(int, sys.argv[1:2]))
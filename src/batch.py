@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import shlex
+import sys
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+import client
+from categorierCli import CategorierCli
+from nodes import NodesManager
+from printer import Printer
+
+SAVE_EVERY_FLAG = '--save-every'
+
+
+@dataclass
+class BatchSummary:
+	executed: int = 0
+	errors: list[tuple[int, str]] = field(default_factory=list)
+
+
+def report_to_stderr(line_number: int, error: str) -> None:
+	print(f'line {line_number}: {error}', file=sys.stderr)
+
+
+class BatchRunner:
+	'''
+	Runs newline-separated commands against a single load of the data, saving every few commands and at the end
+	'''
+
+	def __init__(self, cli: CategorierCli, save_every: int = None, report: Callable[[int, str], None] = report_to_stderr):
+		self._cli = cli
+		self.save_every = save_every
+		self._report = report
+		self._errors: list[str] = []
+		self._unsaved: list[list[str]] = []
+
+	def run(self, lines: Iterable[str]) -> BatchSummary:
+		summary = BatchSummary()
+		previous_err, Printer.err = Printer.err, self._collect_error
+		try:
+			for line_number, line in enumerate(lines, 1):
+				argv = shlex.split(line, comments=True)
+				if not argv:
+					continue
+				for error in self._execute(argv):
+					summary.errors.append((line_number, error))
+					self._report(line_number, error)
+				summary.executed += 1
+				if self.save_every and not summary.executed % self.save_every:
+					self._save()
+		finally:
+			Printer.err = previous_err
+			self._save()
+		return summary
+
+	def _collect_error(self, message: str) -> None:
+		self._errors.append(message)
+
+	def _execute(self, argv: list[str]) -> list[str]:
+		self._errors = []
+		try:
+			self._cli.parse([client.BATCH_KEYWORD, *argv])
+			self._unsaved.append(argv)
+		except Exception as e:
+			errors = self._errors
+			self._roll_back()
+			self._errors = [*errors, f'{type(e).__name__}: {e}']
+		return self._errors
+
+	def _roll_back(self) -> None:
+		'''
+		Drops what the failed line half-applied: reloads the last save and quietly replays the lines that succeeded since.
+		Saving right away keeps every line from being replayed more than once
+		'''
+		NodesManager.reload_data()
+		previous_out, Printer.out = Printer.out, self._ignore
+		try:
+			for argv in self._unsaved:
+				self._cli.parse([client.BATCH_KEYWORD, *argv])
+		finally:
+			Printer.out = previous_out
+		self._save()
+
+	@staticmethod
+	def _ignore(*args, **kwargs) -> None:
+		pass
+
+	def _save(self) -> None:
+		NodesManager.save_data()
+		self._unsaved = []
+
+
+class DaemonBatchRunner(BatchRunner):
+	'''
+	Forwards the commands to a running daemon, which saves them itself
+	'''
+
+	def __init__(self, save_every: int = None, report: Callable[[int, str], None] = report_to_stderr):
+		super().__init__(None, save_every, report)
+
+	def _execute(self, argv: list[str]) -> list[str]:
+		response = client.run_command([client.BATCH_KEYWORD, *argv], on_line=Printer.print)
+		if not response:  # no daemon anymore, or it closed the connection without an answer
+			return [client.DAEMON_DISCONNECTED]
+		return [response['error']] if response['error'] else []
+
+	def _save(self) -> None:
+		pass
+
+
+def parse_batch_args(args: list[str]) -> tuple[str | None, int | None]:
+	save_every = None
+	if SAVE_EVERY_FLAG in args:
+		index = args.index(SAVE_EVERY_FLAG)
+		save_every = int(args[index + 1])
+		args = args[:index] + args[index + 2:]
+	return (args[0] if args else None), save_every
@@ -1,8 +1,8 @@
+import shlex
 from dataclasses import dataclass
 from itertools import chain, repeat
 from typing import Iterable, Callable
 
-from more_itertools import split_at, unique_everseen
 from smartcli import Cli, Flag, VisibleNode, CliCollection
 
 from exceptions import NodeExistsInDataBase
@@ -23,6 +23,8 @@ class Keywords:
 	RENAME = 'rename'
 	SEARCH = 'search'
 	SHOW = 'show'
+	IMPORT = 'import'
+	EXPORT = 'export'
 
 	FLAT_SHORT = '-f'
 	FLAT_LONG = '--flat'
@@ -30,6 +32,12 @@ class Keywords:
 	ALL_FLAT_LONG = '--all-flat'
 	WITH_PARENTS = '--with_parents'
 	WITH_CHILDREN = '--with_children'
+	EXPLAIN = '--explain'
+	LIMIT = '--limit'
+	OFFSET = '--offset'
+	PARALLEL = '--parallel'
+	DEPTH = '--depth'
+	MAX_ITEMS = '--max-items'
 	MANY = 'many'
 	AND = 'and'
 	OR = 'or'
@@ -47,6 +55,9 @@ class Keywords:
 	ARGUMENTS = 'arguments'
 	MEMO = 'memo'
 	NONE = 'None'
+	PATH = 'path'
+	FORMAT = 'format'
+	JSONL = 'jsonl'
 
 	TO = 'to'
 	FROM = 'from'
@@ -99,6 +110,12 @@ class CategorierCli(Cli):
 		self._description_flag: Flag = None
 		self._flat_flag: Flag = None
 		self._all_flat_flag: Flag = None
+		self._explain_flag: Flag = None
+		self._limit_flag: Flag = None
+		self._offset_flag: Flag = None
+		self._parallel_flag: Flag = None
+		self._depth_flag: Flag = None
+		self._max_items_flag: Flag = None
 
 		self._delete_node: VisibleNode = None
 		self._delete_description_node: VisibleNode = None
@@ -108,17 +125,71 @@ class CategorierCli(Cli):
 		self._show_node: VisibleNode = None
 		self._change_node: VisibleNode = None
 		self._change_value_node: VisibleNode = None
+		self._import_node: VisibleNode = None
+		self._export_node: VisibleNode = None
 
 		self._argument_collection = self.root.add_collection('argument_collection')
 		self._create_general_flags()
-		self._create_add_node()
-		self._create_categorize_node()
-		self._create_set_node()
-		self._create_unset_node()
-		self._create_delete_node()
-		self._create_show_node()
-		self._create_search_node()
-		self._create_change_node()
+		self._subtree_creators: dict[str, Callable[[], None]] = self._get_subtree_creators()
+
+	def _get_subtree_creators(self) -> dict[str, Callable[[], None]]:
+		K = Keywords
+		return {
+			K.ADD: self._create_add_node,
+			K.CATEGORIZE: self._create_categorize_node,
+			K.CAT: self._create_categorize_node,
+			K.SET: self._create_set_node,
+			K.UNSET: self._create_unset_node,
+			K.DELETE: self._create_delete_node,
+			K.DEL: self._create_delete_node,
+			K.SHOW: self._create_show_node,
+			K.SEARCH: self._create_search_node,
+			K.CHANGE: self._create_change_node,
+			K.RENAME: self._create_change_node,
+			K.IMPORT: self._create_import_node,
+			K.EXPORT: self._create_export_node,
+		}
+
+	def parse_without_actions(self, args: list[str] | str = None) -> None:
+		if isinstance(args, str):
+			args = shlex.split(args)
+		self._create_subtree_for(args or [])
+		self._reset_storages()
+		super().parse_without_actions(args)
+
+	def _reset_storages(self) -> None:
+		'''
+		smartcli gathers what to reset into a set, where storages holding equal values collapse into one and only that one gets cleared
+		'''
+		nodes = [self.root]
+		while nodes:
+			node = nodes.pop()
+			nodes.extend(chain(node.get_visible_nodes(), node.get_hidden_nodes()))
+			for final in chain(node.get_flags(), node.get_params()):
+				for storage in final._get_resetable():
+					storage.reset()
+			for collection in node.get_collections():
+				collection.reset()
+
+	def _create_subtree_for(self, args: list[str]) -> None:
+		'''
+		Builds only the command the arguments start with, or every one when there is none to pick
+		'''
+		keyword = next(filter(self._subtree_creators.__contains__, args[1:]), None)
+		if keyword is None:
+			self.create_all_subtrees()
+		else:
+			self._create_subtree(self._subtree_creators[keyword])
+
+	def create_all_subtrees(self) -> None:
+		for create in dict.fromkeys(self._subtree_creators.values()):
+			self._create_subtree(create)
+
+	def _create_subtree(self, create: Callable[[], None]) -> None:
+		for keyword, creator in list(self._subtree_creators.items()):
+			if creator == create:
+				del self._subtree_creators[keyword]
+		create()
 
 	def set_out_stream(self, out):
 		super().set_out_stream(out)
@@ -135,10 +206,16 @@ class CategorierCli(Cli):
 		self._description_flag = self.root.add_flag(K.DESCRIPTION_FLAG, multi=True)
 		self._flat_flag = self.root.add_flag(K.FLAT_LONG, K.FLAT_SHORT, flag_limit=0)
 		self._all_flat_flag = self.root.add_flag(K.ALL_FLAT_LONG, K.FLAT_SHORT, flag_limit=0)
+		self._limit_flag = self.root.add_flag(K.LIMIT, flag_limit=1)
+		self._offset_flag = self.root.add_flag(K.OFFSET, flag_limit=1)
+		self._with_parents = self.root.add_flag(K.WITH_PARENTS, flag_limit=None)
+		self._with_children = self.root.add_flag(K.WITH_CHILDREN, flag_limit=None)
+		self._explain_flag = self.root.add_flag(K.EXPLAIN, flag_limit=0)
+		self._parallel_flag = self.root.add_flag(K.PARALLEL, flag_limit=0)
+		self._depth_flag = self.root.add_flag(K.DEPTH, flag_limit=1)
+		self._max_items_flag = self.root.add_flag(K.MAX_ITEMS, flag_limit=1)
 
 	def _create_add_node(self):
-		self._with_parents = self.root.add_flag(Keywords.WITH_PARENTS, flag_limit=None)
-		self._with_children = self.root.add_flag(Keywords.WITH_CHILDREN, flag_limit=None)
 		self._create_main_add_node()
 		self._create_add_many_node()
 		self._create_add_description_node()
@@ -177,11 +254,11 @@ class CategorierCli(Cli):
 			if set_args:
 				self.parse(set_args)
 
-			# TODO: msg
-		except NodeExistsInDataBase:
-			pass  # TODO: msg
+		except NodeExistsInDataBase as e:
+			self._report_existing_node(e)
 
 	def _add_node_flat_action(self):
+		from more_itertools import unique_everseen
 		try:
 			name = self._add_node.get_param(CliElements.NAME).get()
 			children = self._with_children.get_as_list()
@@ -192,8 +269,8 @@ class CategorierCli(Cli):
 			node = NodesManager.add_node(name, parents=list(unique_parents), children=children)
 			descriptions = self._description_flag.get_as_list()
 			node[MemberTypes.DESCRIPTIONS].extend(descriptions)
-		except NodeExistsInDataBase:
-			pass  # TODO: msg
+		except NodeExistsInDataBase as e:
+			self._report_existing_node(e)
 
 	def _create_add_many_node(self):
 		self._add_many_node = self._add_node.add_node(Keywords.MANY)
@@ -212,10 +289,14 @@ class CategorierCli(Cli):
 			all_descriptions = self._split_by_conjunction_or_repeat(descriptions, n=n)
 
 			NodesManager.add_nodes(*node_names, all_parents=all_parents, all_children=all_children, all_descriptions=all_descriptions)
-		except NodeExistsInDataBase:
-			pass  # TODO: msg
+		except NodeExistsInDataBase as e:
+			self._report_existing_node(e)
+
+	def _report_existing_node(self, error: NodeExistsInDataBase):
+		Printer.print_error(f'Node "{error}" already exists')
 
 	def _split_by_conjunction_or_repeat(self, collection: list, conjunction=Keywords.AND, n=None):
+		from more_itertools import split_at
 		if conjunction not in collection:
 			return repeat(collection, n)
 		return split_at(collection, lambda x: x == conjunction, keep_separator=False)
@@ -238,6 +319,7 @@ class CategorierCli(Cli):
 		self._add_values_node.add_action(self._add_values_action)
 
 	def _add_values_action(self):
+		from more_itertools import split_at
 		node_names = self._prep_flag.get_as_list()
 		arguments = self._add_values_node.get_param(Keywords.ARGUMENTS).get_as_list()
 		key_value_pairs = list(split_at(arguments, lambda a: a == Keywords.AND, keep_separator=False))
@@ -272,6 +354,7 @@ class CategorierCli(Cli):
 		return any(map(Flag.is_active, (self._flat_flag, self._all_flat_flag)))
 
 	def _get_desire_flat_parents(self, parents: Iterable[str]) -> Iterable[str]:
+		from more_itertools import unique_everseen
 		parents = list(parents)
 		if self._flat_flag.is_active():
 			desired = self._get_ancestors_using(parents, Node.get_final_ancestors)
@@ -294,6 +377,7 @@ class CategorierCli(Cli):
 		self._set_node.add_action(self._set_node_action)
 
 	def _set_node_action(self):
+		from more_itertools import split_at
 		node_names = self._prep_flag.get_as_list()
 		arguments = self._set_node.get_param(Keywords.ARGUMENTS).get_as_list()
 		key_value_pairs = list(split_at(arguments, lambda a: a == Keywords.AND, keep_separator=False))
@@ -308,6 +392,7 @@ class CategorierCli(Cli):
 		self._unset_node.add_action(self._unset_node_action)
 
 	def _unset_node_action(self):
+		from more_itertools import split_at
 		node_names = self._prep_flag.get_as_list()
 		arguments = self._argument_collection.get_as_list()
 		key_value_pairs = list(split_at(arguments, lambda a: a == Keywords.AND, keep_separator=False))
@@ -317,12 +402,10 @@ class CategorierCli(Cli):
 				if not to_unsets:
 					del node[key]
 				else:
-					for i, to_unset in enumerate(to_unsets):
-						if to_unset in node[key]:
-							node[key].remove(to_unset)
-						elif to_unset.isnumeric():
-							to_unset = int(to_unset) - 1 - i
-							del node[key][to_unset]
+					values = node[key]
+					indexes = {values.index(to_unset) if to_unset in values else int(to_unset) - 1 for to_unset in to_unsets if to_unset in values or to_unset.isnumeric()}
+					for index in sorted(indexes, reverse=True):  # the numbers refer to the values before the removal
+						del values[index]
 
 	def _create_delete_node(self):
 		self._create_main_delete_node()
@@ -337,12 +420,8 @@ class CategorierCli(Cli):
 
 	def _delete_action(self):
 		to_deletes: list[str] = self._delete_node.get_param(Keywords.NODES).get_as_list()
-		for i, to_delete in enumerate(to_deletes):
-			if to_delete.isnumeric():
-				to_delete = list(NodesManager.get_all_names())[int(to_delete)-1 - i]
-			else:
-				to_delete
-			NodesManager.delete_node(to_delete)
+		to_deletes = [NodesManager.get_name_by_number(int(to_delete)) if to_delete.isnumeric() else to_delete for to_delete in to_deletes]
+		NodesManager.delete_nodes(*to_deletes)
 
 	def _create_delete_description_node(self):
 		self._delete_description_node = self._delete_node.add_node(Keywords.DESCRIPTION, Keywords.DESCRIPTIONS, Keywords.DESCR)
@@ -400,6 +479,7 @@ class CategorierCli(Cli):
 		self._search_node.add_action(self._search_node_action)
 
 	def _search_node_action(self):
+		from more_itertools import split_at
 		criteria = self._prep_flag.get_as_list()
 		if not criteria:
 			self._prep_flag.get_storage().append(Keywords.MEMO)
@@ -410,8 +490,18 @@ class CategorierCli(Cli):
 		grouped_by_criteria = list(split_at(criteria, lambda w: w in (K.AND, K.OR), keep_separator=False))
 		if not arguments:
 			criteria, arguments = zip(*grouped_by_criteria)
-		found = NodesManager.search_node(criteria, arguments, func)
-		Printer.print_short_node_info(found)
+		if self._explain_flag.is_active():
+			Printer.print_lines(NodesManager.plan_search(criteria, arguments, func).explain())
+			return
+		offset, limit = self._get_page()
+		parallel = True if self._parallel_flag.is_active() else None
+		found = NodesManager.search_node(criteria, arguments, func, offset=offset, limit=limit, parallel=parallel)
+		Printer.print_short_node_info(NodesManager.record_listing(found, offset), offset)
+
+	def _get_page(self) -> tuple[int, int | None]:
+		offset = int(self._offset_flag.get()) if self._offset_flag.is_active() else 0
+		limit = int(self._limit_flag.get()) if self._limit_flag.is_active() else None
+		return offset, limit
 
 	def _create_change_node(self):
 		self._create_main_change_node()
@@ -428,7 +518,8 @@ class CategorierCli(Cli):
 	def _create_generic_change_node(self, name) -> VisibleNode:
 		node = VisibleNode(name)
 		node.set_params('old', 'new')
-		node.add_action_when_is_active(self._change_node_name, self._prep_flag)
+		old, new = node.get_params('old', 'new')
+		node.add_action(lambda: self._change_node_name(old.get(), new.get()))
 		return node
 
 	def _create_rename_node(self):
@@ -436,13 +527,15 @@ class CategorierCli(Cli):
 		rename_node.set_params('old', 'new')
 		old, new = rename_node.get_params('old', 'new')
 		rename_node.add_action_when_is_active(lambda: self._change_key_name(old.get(), new.get()), self._prep_flag)
-		rename_node.add_action_when_is_inactive(self._change_node_name, self._prep_flag)
+		rename_node.add_action_when_is_inactive(lambda: self._change_node_name(old.get(), new.get()), self._prep_flag)
 
 	def _change_node_name(self, old=None, new=None):
 		old = old or self._change_node.get_param('old').get()
 		new = new or self._change_node.get_param('new').get()
-		node = NodesManager.get_node(old)
-		NodesManager.create_node_from_data(new, node.to_dict()[old])
+		try:
+			NodesManager.rename_node(old, new)
+		except NodeExistsInDataBase as e:
+			self._report_existing_node(e)
 
 	def _change_key_name(self, old=None, new=None):
 		old = old or self._change_node.get_param('old').get()
@@ -477,6 +570,27 @@ class CategorierCli(Cli):
 				del elems[index]
 				elems.insert(index, new)
 
+	def _create_import_node(self):
+		self._import_node = self.root.add_node(Keywords.IMPORT)
+		self._import_node.add_param(Keywords.PATH)
+		self._import_node.add_action(self._import_action)
+
+	def _import_action(self):
+		from transfer import import_file
+		summary = import_file(self._import_node.get_param(Keywords.PATH).get())
+		Printer.print_import_summary(summary)
+
+	def _create_export_node(self):
+		self._export_node = self.root.add_node(Keywords.EXPORT)
+		self._export_node.add_param(Keywords.FORMAT)
+		self._export_node.get_param(Keywords.FORMAT).set_default(Keywords.JSONL)
+		self._export_node.add_action(self._export_action)
+
+	def _export_action(self):
+		from transfer import export_lines
+		export_format = self._export_node.get_param(Keywords.FORMAT).get()
+		Printer.print_lines(export_lines(export_format, self._prep_flag.get_as_list()))
+
 	def _create_show_node(self):
 		self._show_node = self.root.add_node(Keywords.SHOW)
 		self._show_node.add_param(Keywords.NODE)
@@ -486,8 +600,14 @@ class CategorierCli(Cli):
 	def _show_node_action(self):
 		name = self._show_node.get_param(Keywords.NODE).get()
 		if name is None or name == Keywords.ALL:
-			nodes = NodesManager.get_all_nodes()
-			Printer.print_short_node_info(nodes)
+			offset, limit = self._get_page()
+			nodes = NodesManager.get_all_nodes(offset, limit)
+			Printer.print_short_node_info(NodesManager.record_listing(nodes, offset), offset)
 		else:
 			node = NodesManager.get_node(name)
-			Printer.print_detailed_node_info(node)
+			Printer.print_detailed_node_info(node, *self._get_detail_limits())
+
+	def _get_detail_limits(self) -> tuple[int | None, int | None]:
+		depth = int(self._depth_flag.get()) if self._depth_flag.is_active() else None
+		max_items = int(self._max_items_flag.get()) if self._max_items_flag.is_active() else None
+		return depth, max_items
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Callable, Iterator
+
+DAEMON_FLAG = '--daemon'
+STOP_DAEMON_FLAG = '--stop-daemon'
+BATCH_KEYWORD = 'batch'
+DAEMON_DISCONNECTED = 'The daemon disconnected'
+SOCKET_PATH = Path(__file__).parent.parent / 'resources' / 'categorier.sock'
+
+
+def write_message(connection: socket.socket, message: dict) -> None:
+	connection.sendall(json.dumps(message).encode() + b'\n')
+
+
+def read_message(connection: socket.socket) -> dict:
+	with connection.makefile('rb') as stream:
+		return json.loads(stream.readline() or b'{}')
+
+
+def read_messages(connection: socket.socket) -> Iterator[dict]:
+	with connection.makefile('rb') as stream:
+		for line in stream:
+			yield json.loads(line)
+
+
+def read_response(connection: socket.socket, on_line: Callable[[str], None] = None) -> dict:
+	'''
+	Reads the output lines the daemon streams while it runs the command, up to its closing message with the error.
+	The lines go to on_line as they come, or into the response without one. Returns {} if the daemon disconnects before the end
+	'''
+	lines = []
+	for message in read_messages(connection):
+		if 'line' not in message:
+			return {'lines': lines, 'error': message.get('error')}
+		(on_line or lines.append)(message['line'])
+	return {}
+
+
+def send_request(request: dict, socket_path: Path = SOCKET_PATH, on_line: Callable[[str], None] = None) -> dict | None:
+	'''
+	Returns the daemon's response or None when no daemon listens on the socket
+	'''
+	if not hasattr(socket, 'AF_UNIX') or not socket_path.exists():
+		return None
+	try:
+		with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+			connection.connect(str(socket_path))
+			write_message(connection, request)
+			return read_response(connection, on_line)
+	except (ConnectionRefusedError, FileNotFoundError):
+		return None
+
+
+def run_command(argv: list[str], socket_path: Path = SOCKET_PATH, cwd: str = None, on_line: Callable[[str], None] = None) -> dict | None:
+	return send_request({'argv': argv, 'cwd': cwd or os.getcwd()}, socket_path, on_line)
+
+
+def stop_daemon(socket_path: Path = SOCKET_PATH) -> bool:
+	return send_request({'stop': True}, socket_path) is not None
+
+
+def is_daemon_running(socket_path: Path = SOCKET_PATH) -> bool:
+	return send_request({'ping': True}, socket_path) is not None
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import os
+import socket
+from pathlib import Path
+from typing import Callable
+
+from categorierCli import CategorierCli
+from client import SOCKET_PATH, is_daemon_running, read_message, write_message
+from exceptions import DaemonAlreadyRunning
+from nodes import NodesManager, Paths
+from printer import Printer
+
+
+class Daemon:
+	'''
+	Keeps the data, the indexes and the command tree loaded, running the commands the clients send over a Unix socket
+	'''
+	index_switches = ('use_topological_index', 'use_final_members_index', 'use_compact_graph', 'use_attribute_index', 'use_trigram_index')
+	request_timeout = 5.0
+	answer_timeout = 60.0
+
+	def __init__(self, socket_path: Path = SOCKET_PATH, database_path: Path = None):
+		self.socket_path = Path(socket_path).resolve()  # the commands run in their client's directory
+		self.database_path = Path(database_path or Paths.get_database()).resolve()
+		self._cli: CategorierCli = None
+		self._lines: list[str] = []
+		self._on_line: Callable[[str], None] = self._lines.append
+		self._errors: list[str] = []
+		self._is_running = False
+
+	def serve(self) -> None:
+		with self._bind() as server:
+			try:
+				self._load()
+				self._is_running = True
+				while self._is_running:
+					connection, _ = server.accept()
+					with connection:
+						self._handle(connection)
+			finally:
+				if self._cli is not None:
+					NodesManager.save_data()
+				self.socket_path.unlink(missing_ok=True)
+
+	def _bind(self) -> socket.socket:
+		if is_daemon_running(self.socket_path):
+			raise DaemonAlreadyRunning(str(self.socket_path))
+		self.socket_path.unlink(missing_ok=True)
+		server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		server.bind(str(self.socket_path))
+		os.chmod(self.socket_path, 0o600)
+		server.listen()
+		return server
+
+	def _load(self) -> None:
+		for switch in self.index_switches:
+			setattr(NodesManager, switch, True)
+		NodesManager.load_data(self.database_path)
+		NodesManager.get_topological_index()
+		NodesManager.get_final_members_index()
+		NodesManager.get_compact_graph()
+		NodesManager.get_attribute_index()
+		self._cli = CategorierCli()
+		self._cli.set_out_stream(self._collect)
+		self._cli.create_all_subtrees()
+
+	def _collect(self, line='', **kwargs) -> None:
+		self._on_line(str(line))
+
+	def _handle(self, connection: socket.socket) -> None:
+		connection.settimeout(self.request_timeout)  # one client at a time, so a silent one must not hold up the rest
+		try:
+			request = read_message(connection)
+		except socket.timeout:
+			return
+		except (ValueError, OSError) as e:  # not JSON, not UTF-8, or the client went away
+			return self._answer(connection, {'error': f'Bad request: {type(e).__name__}: {e}'})
+		error = self._get_request_error(request)
+		if error is not None:
+			return self._answer(connection, {'error': error})
+		if request.get('stop'):
+			self._is_running = False
+		if 'argv' in request:
+			connection.settimeout(self.answer_timeout)  # a reader behind a pipe may pause for a while
+			error = self.execute(request['argv'], request.get('cwd'), self._stream_to(connection))['error']
+		self._answer(connection, {'error': error})
+
+	@classmethod
+	def _get_request_error(cls, request) -> str | None:
+		if not isinstance(request, dict):
+			return 'Bad request: expected a JSON object'
+		argv = request.get('argv', [])
+		if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+			return 'Bad request: argv must be a list of strings'
+		if not isinstance(request.get('cwd', ''), str):
+			return 'Bad request: cwd must be a string'
+		return None
+
+	def _answer(self, connection: socket.socket, message: dict) -> bool:
+		try:
+			write_message(connection, message)
+			return True
+		except OSError:  # the client left or stopped reading
+			return False
+
+	def _stream_to(self, connection: socket.socket) -> Callable[[str], None]:
+		'''
+		Sends each output line as it is printed, so that e.g. an export never piles up in the daemon's memory
+		'''
+		is_listening = True
+
+		def send(line: str) -> None:
+			nonlocal is_listening
+			is_listening = is_listening and self._answer(connection, {'line': line})  # the command still finishes without a reader
+
+		return send
+
+	def execute(self, argv: list[str], cwd: str = None, on_line: Callable[[str], None] = None) -> dict:
+		'''
+		Runs the command in the client's directory, so that relative paths, e.g. of an import, mean what the client meant.
+		The output goes to on_line if given, else into the returned lines
+		'''
+		self._lines = []
+		self._on_line = on_line or self._lines.append
+		self._errors = []
+		previous_err, Printer.err = Printer.err, self._errors.append
+		previous_cwd = os.getcwd()
+		try:
+			if cwd:
+				os.chdir(cwd)
+			self._cli.parse(argv)
+			NodesManager.save_data()
+		except Exception as e:
+			NodesManager.load_data(self.database_path)  # drops whatever the failed command half-applied
+			self._errors.append(f'{type(e).__name__}: {e}')
+		finally:
+			os.chdir(previous_cwd)
+			Printer.err = previous_err
+		return {'lines': self._lines, 'error': '\n'.join(self._errors) or None}
@@ -1,2 +1,6 @@
 class NodeExistsInDataBase(ValueError):
 	pass
+
+
+class DaemonAlreadyRunning(RuntimeError):
+	pass
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from array import array
+from typing import Iterable, Iterator
+
+from indexes import Adjacency, GraphIndex, MembersGetter
+
+
+class CompactAdjacency:
+	'''
+	Compressed sparse rows of member ids, the rows changed since the last compaction being kept aside
+	'''
+	compaction_threshold = 64
+
+	def __init__(self, rows: Iterable[Iterable[int]] = ()):
+		self._offsets = array('i', [0])
+		self._targets = array('i')
+		for row in rows:
+			self._targets.extend(row)
+			self._offsets.append(len(self._targets))
+		self._changed: dict[int, array] = {}
+
+	def __len__(self):
+		return len(self._offsets) - 1
+
+	def get_row(self, id: int) -> array:
+		try:
+			return self._changed[id]
+		except KeyError:
+			pass
+		if id >= len(self):
+			return array('i')
+		return self._targets[self._offsets[id]:self._offsets[id + 1]]
+
+	def set_row(self, id: int, row: array) -> None:
+		self._changed[id] = row
+
+	def should_be_compacted(self) -> bool:
+		return len(self._changed) > max(self.compaction_threshold, len(self) // 4)
+
+	def compacted(self, size: int) -> CompactAdjacency:
+		return CompactAdjacency(map(self.get_row, range(size)))
+
+	def get_memory_size(self) -> int:
+		return sum(row.itemsize * len(row) for row in (self._offsets, self._targets, *self._changed.values()))
+
+	def walk(self, start: int, size: int, only_final: bool = False) -> Iterator[int]:
+		offsets, targets, changed, row_count = self._offsets, self._targets, self._changed, len(self)
+		visited = bytearray(size)
+		visited[start] = 1
+		to_visit = [start]
+		while to_visit:
+			id = to_visit.pop()
+			if id in changed:
+				row = changed[id]
+			elif id < row_count:
+				row = targets[offsets[id]:offsets[id + 1]]
+			else:
+				continue
+			for member in row:
+				if not visited[member]:
+					visited[member] = 1
+					to_visit.append(member)
+					if not only_final or not self._has_members(member):
+						yield member
+
+	def _has_members(self, id: int) -> bool:
+		if id in self._changed:
+			return bool(self._changed[id])
+		return id < len(self) and self._offsets[id] != self._offsets[id + 1]
+
+
+class CompactGraph(GraphIndex):
+	'''
+	Graph of interned integer ids kept as compressed sparse rows in both directions, so traversals are loops over ints
+	'''
+
+	def __init__(self, get_parents: MembersGetter, get_children: MembersGetter):
+		super().__init__(get_parents, get_children)
+		self._ids: dict[str, int] = {}
+		self._names: list[str | None] = []
+		self._parents = CompactAdjacency()
+		self._children = CompactAdjacency()
+
+	def build(self, adjacency: Adjacency) -> None:
+		adjacency = [(name, list(children)) for name, children in adjacency]
+		self._ids, self._names = {}, []
+		for name, children in adjacency:
+			self._intern(name)
+			for child in children:
+				self._intern(child)
+		parent_rows = [[] for _ in self._names]
+		child_rows = [[] for _ in self._names]
+		for name, children in adjacency:
+			id = self._ids[name]
+			for child in children:
+				child_id = self._ids[child]
+				child_rows[id].append(child_id)
+				parent_rows[child_id].append(id)
+		self._parents = CompactAdjacency(parent_rows)
+		self._children = CompactAdjacency(child_rows)
+		super().build(adjacency)
+
+	def clear(self) -> None:
+		self._ids, self._names = {}, []
+		self._parents = CompactAdjacency()
+		self._children = CompactAdjacency()
+		super().clear()
+
+	def _intern(self, name: str) -> int:
+		try:
+			return self._ids[name]
+		except KeyError:
+			self._ids[name] = len(self._names)
+			self._names.append(name)
+			return self._ids[name]
+
+	def __len__(self):
+		return len(self._ids)
+
+	def get_memory_size(self) -> int:
+		return self._parents.get_memory_size() + self._children.get_memory_size()
+
+	def get_ancestors(self, name: str) -> Iterable[str]:
+		return map(self._names.__getitem__, self._walk(name, self._parents))
+
+	def get_descendants(self, name: str) -> Iterable[str]:
+		return map(self._names.__getitem__, self._walk(name, self._children))
+
+	def get_final_ancestors(self, name: str) -> Iterable[str]:
+		return map(self._names.__getitem__, self._walk(name, self._parents, only_final=True))
+
+	def get_final_descendants(self, name: str) -> Iterable[str]:
+		return map(self._names.__getitem__, self._walk(name, self._children, only_final=True))
+
+	def _walk(self, name: str, adjacency: CompactAdjacency, only_final: bool = False) -> Iterator[int]:
+		if name not in self._ids:
+			return iter(())
+		return adjacency.walk(self._ids[name], len(self._names), only_final)
+
+	def edge_added(self, parent: str, child: str) -> None:
+		if not self.is_built:
+			return
+		parent_id, child_id = self._intern(parent), self._intern(child)
+		self._children.set_row(parent_id, self._children.get_row(parent_id) + array('i', [child_id]))
+		self._parents.set_row(child_id, self._parents.get_row(child_id) + array('i', [parent_id]))
+		self._compact_if_needed()
+
+	def edge_removed(self, parent: str, child: str) -> None:
+		if not self.is_built or parent not in self._ids or child not in self._ids:
+			return
+		parent_id, child_id = self._ids[parent], self._ids[child]
+		self._children.set_row(parent_id, array('i', (id for id in self._children.get_row(parent_id) if id != child_id)))
+		self._parents.set_row(child_id, array('i', (id for id in self._parents.get_row(child_id) if id != parent_id)))
+		self._compact_if_needed()
+
+	def _compact_if_needed(self) -> None:
+		if self._children.should_be_compacted() or self._parents.should_be_compacted():
+			self._parents = self._parents.compacted(len(self._names))
+			self._children = self._children.compacted(len(self._names))
+
+	def node_deleted(self, name: str) -> None:
+		if name not in self._ids:
+			return
+		id = self._ids.pop(name)
+		self._names[id] = None
+		self._parents.set_row(id, array('i'))
+		self._children.set_row(id, array('i'))
+
+	def node_renamed(self, old: str, new: str) -> None:
+		if old not in self._ids:
+			return
+		self._ids[new] = self._ids.pop(old)
+		self._names[self._ids[new]] = new
@@ -0,0 +1,685 @@
+from __future__ import annotations
+
+import re
+from abc import ABC
+from bisect import bisect_left
+from itertools import chain, islice, takewhile
+from typing import Any, Callable, Iterable, Iterator, Pattern
+
+try:
+	from re import _parser as sre_parse
+except ImportError:
+	import sre_parse
+
+Adjacency = Iterable[tuple[str, Iterable[str]]]
+MembersGetter = Callable[[str], Iterable[str]]
+
+
+class GraphIndex(ABC):
+
+	def __init__(self, get_parents: MembersGetter, get_children: MembersGetter):
+		self._get_parents = get_parents
+		self._get_children = get_children
+		self.is_built = False
+
+	def build(self, adjacency: Adjacency) -> None:
+		self.is_built = True
+
+	def clear(self) -> None:
+		self.is_built = False
+
+	def node_added(self, name: str) -> None:
+		pass
+
+	def edge_added(self, parent: str, child: str) -> None:
+		pass
+
+	def edge_removed(self, parent: str, child: str) -> None:
+		pass
+
+	def node_deleted(self, name: str) -> None:
+		pass
+
+	def node_renamed(self, old: str, new: str) -> None:
+		'''
+		Called once the neighbours point at the new name; indexes without a cheaper way rebuild on demand
+		'''
+		if self.is_built:
+			self.clear()
+
+
+def rename_key(mapping: dict, old: str, new: str) -> None:
+	if old in mapping:
+		mapping[new] = mapping.pop(old)
+
+
+def get_topological_order(adjacency: Adjacency) -> list[str]:
+	children_of = {name: list(children) for name, children in adjacency}
+	in_degrees = dict.fromkeys(children_of, 0)
+	for children in children_of.values():
+		for child in children:
+			in_degrees[child] = in_degrees.get(child, 0) + 1
+	order = [name for name, degree in in_degrees.items() if not degree]
+	for name in order:
+		for child in children_of.get(name, ()):
+			in_degrees[child] -= 1
+			if not in_degrees[child]:
+				order.append(child)
+	return order
+
+
+def get_cycle_names(adjacency: Adjacency) -> set[str]:
+	'''
+	Names on a cycle or on a path between two cycles, empty for an acyclic graph
+	'''
+	children_of = {name: list(children) for name, children in adjacency}
+	unordered = set(children_of).union(*children_of.values()).difference(get_topological_order(children_of.items()))
+	parents_of = {name: [] for name in unordered}
+	for name in unordered:
+		for child in children_of.get(name, ()):
+			if child in unordered:
+				parents_of[child].append(name)
+	return unordered.difference(get_topological_order(parents_of.items()))
+
+
+class ClosureIndex(GraphIndex):
+
+	def __init__(self, get_parents: MembersGetter, get_children: MembersGetter):
+		super().__init__(get_parents, get_children)
+		self._ancestors: dict[str, dict[str, None]] = {}
+		self._descendants: dict[str, dict[str, None]] = {}
+
+	def build(self, adjacency: Adjacency) -> None:
+		adjacency = [(name, list(children)) for name, children in adjacency]
+		children_of = dict(adjacency)
+		self._ancestors = {name: {} for name in children_of}
+		self._descendants = {}
+		for name in reversed(get_topological_order(adjacency)):
+			descendants = {}
+			for child in children_of.get(name, ()):
+				descendants[child] = None
+				descendants.update(self._descendants.get(child, {}))
+			self._descendants[name] = descendants
+			for descendant in descendants:
+				self._ancestors[descendant][name] = None
+		super().build(adjacency)
+
+	def clear(self) -> None:
+		self._ancestors.clear()
+		self._descendants.clear()
+		super().clear()
+
+	def get_ancestors(self, name: str) -> Iterable[str]:
+		return self._ancestors.get(name, {}).keys()
+
+	def get_descendants(self, name: str) -> Iterable[str]:
+		return self._descendants.get(name, {}).keys()
+
+	def edge_added(self, parent: str, child: str) -> None:
+		if not self.is_built:
+			return
+		uppers = [parent, *self.get_ancestors(parent)]
+		uppers = [upper for upper in uppers if child not in self._descendants.setdefault(upper, {})]
+		lowers = [child, *self.get_descendants(child)]
+		for upper in uppers:
+			self._descendants[upper].update(dict.fromkeys(lowers))
+		for lower in lowers:
+			self._ancestors.setdefault(lower, {}).update(dict.fromkeys(uppers))
+
+	def edge_removed(self, parent: str, child: str) -> None:
+		if not self.is_built:
+			return
+		uppers = [parent, *self.get_ancestors(parent)]
+		lowers = [child, *self.get_descendants(child)]
+		self._recompute(uppers, self._descendants, self._get_children)
+		self._recompute(lowers, self._ancestors, self._get_parents)
+
+	def _recompute(self, names: list[str], closure: dict[str, dict[str, None]], get_members: MembersGetter) -> None:
+		'''
+		Rebuilds the closures of the given names, each name's members being handled before the name itself
+		'''
+		to_recompute = set(names)
+		for name in names:
+			closure[name] = {}
+		done = set()
+		for start in names:
+			stack = [(start, False)]
+			while stack:
+				name, are_members_done = stack.pop()
+				if name in done:
+					continue
+				members = list(get_members(name))
+				if not are_members_done:
+					stack.append((name, True))
+					stack.extend((member, False) for member in members if member in to_recompute and member not in done)
+					continue
+				done.add(name)
+				for member in members:
+					closure[name][member] = None
+					closure[name].update(closure.get(member, {}))
+
+	def node_deleted(self, name: str) -> None:
+		self._ancestors.pop(name, None)
+		self._descendants.pop(name, None)
+
+	def node_renamed(self, old: str, new: str) -> None:
+		if not self.is_built:
+			return
+		for closure, opposite in ((self._ancestors, self._descendants), (self._descendants, self._ancestors)):
+			members = closure[new] = closure.pop(old, {})
+			for member in members:
+				rename_key(opposite.get(member, {}), old, new)
+
+
+class TopologicalOrderIndex(GraphIndex):
+	'''
+	Pearce-Kelly dynamic topological order: an inserted edge only reorders the nodes between its ends.
+	Nodes without edges are left unordered until their first edge, which places them next to its other end
+	'''
+
+	def __init__(self, get_parents: MembersGetter, get_children: MembersGetter):
+		super().__init__(get_parents, get_children)
+		self._order: dict[str, int] = {}
+		self._first_order = 0
+		self._next_order = 0
+
+	def build(self, adjacency: Adjacency) -> None:
+		adjacency = [(name, list(children)) for name, children in adjacency if children]
+		linked = {name for name, children in adjacency} | {child for name, children in adjacency for child in children}
+		order = [name for name in get_topological_order(adjacency) if name in linked]
+		self._order = {name: i for i, name in enumerate(order)}
+		self._first_order = 0
+		self._next_order = len(self._order)
+		super().build(adjacency)
+
+	def clear(self) -> None:
+		self._order.clear()
+		self._first_order = self._next_order = 0
+		super().clear()
+
+	def get_order(self, name: str) -> int:
+		return self._order[name]
+
+	def reaches(self, source: str, target: str) -> bool:
+		if source == target:
+			return True
+		if source not in self._order or target not in self._order:
+			return False
+		source_order, target_order = self._order[source], self._order[target]
+		if target_order < source_order:
+			return False
+		return self._search(source, self._get_children, lambda order: order <= target_order, target=target) is None
+
+	def _place_first(self, name: str) -> None:
+		self._first_order -= 1
+		self._order[name] = self._first_order
+
+	def _place_last(self, name: str) -> None:
+		self._order[name] = self._next_order
+		self._next_order += 1
+
+	def edge_added(self, parent: str, child: str) -> None:
+		if not self.is_built:
+			return
+		if parent not in self._order:
+			if child not in self._order:
+				self._place_last(child)
+			return self._place_first(parent)
+		if child not in self._order:
+			return self._place_last(child)
+		lower, upper = self._order[child], self._order[parent]
+		if upper < lower:
+			return
+		forward = self._search(child, self._get_children, lambda order: order <= upper)
+		backward = self._search(parent, self._get_parents, lambda order: order >= lower)
+		self._reorder(backward + forward)
+
+	def _search(self, start: str, get_members: MembersGetter, is_in_range: Callable[[int], bool], target: str = None) -> list[str] | None:
+		visited = {start: None}
+		to_visit = [start]
+		while to_visit:
+			for member in get_members(to_visit.pop()):
+				if member == target:
+					return None
+				if member not in visited and is_in_range(self._order[member]):
+					visited[member] = None
+					to_visit.append(member)
+		return sorted(visited, key=self.get_order)
+
+	def _reorder(self, names: list[str]) -> None:
+		'''
+		Hands the names' current positions back out in the given order
+		'''
+		positions = sorted(map(self.get_order, names))
+		for name, position in zip(names, positions):
+			self._order[name] = position
+
+	def node_deleted(self, name: str) -> None:
+		self._order.pop(name, None)
+
+	def node_renamed(self, old: str, new: str) -> None:
+		rename_key(self._order, old, new)
+
+
+class FinalMembersIndex(GraphIndex):
+	'''
+	Roots and leaves of the graph plus memoized final ancestors and descendants.
+	A memoized node implies memoized members on its side, so an invalidation stops at the first node without a memo
+	'''
+
+	def __init__(self, get_parents: MembersGetter, get_children: MembersGetter):
+		super().__init__(get_parents, get_children)
+		self._roots: dict[str, None] = {}
+		self._leaves: dict[str, None] = {}
+		self._final_ancestors: dict[str, tuple[str, ...]] = {}
+		self._final_descendants: dict[str, tuple[str, ...]] = {}
+
+	def build(self, adjacency: Adjacency) -> None:
+		adjacency = [(name, list(children)) for name, children in adjacency]
+		children = {child for name, members in adjacency for child in members}
+		self._roots = {name: None for name, members in adjacency if name not in children}
+		self._leaves = {name: None for name, members in adjacency if not members}
+		self._final_ancestors.clear()
+		self._final_descendants.clear()
+		super().build(adjacency)
+
+	def clear(self) -> None:
+		self._roots.clear()
+		self._leaves.clear()
+		self._final_ancestors.clear()
+		self._final_descendants.clear()
+		super().clear()
+
+	def get_roots(self) -> Iterable[str]:
+		return self._roots.keys()
+
+	def get_leaves(self) -> Iterable[str]:
+		return self._leaves.keys()
+
+	def get_final_ancestors(self, name: str) -> tuple[str, ...]:
+		return self._get_final_members(name, self._final_ancestors, self._get_parents, self._roots)
+
+	def get_final_descendants(self, name: str) -> tuple[str, ...]:
+		return self._get_final_members(name, self._final_descendants, self._get_children, self._leaves)
+
+	def _get_final_members(self, start: str, memo: dict[str, tuple[str, ...]], get_members: MembersGetter, finals: dict[str, None]) -> tuple[str, ...]:
+		stack = [(start, False)]
+		while stack:
+			name, are_members_done = stack.pop()
+			if name in memo:
+				continue
+			members = list(get_members(name))
+			if not are_members_done:
+				stack.append((name, True))
+				stack.extend((member, False) for member in reversed(members) if member not in memo)
+				continue
+			final_members = {}
+			for member in members:
+				if member in finals:
+					final_members[member] = None
+				else:
+					final_members.update(dict.fromkeys(memo[member]))
+			memo[name] = tuple(final_members)
+		return memo[start]
+
+	def _invalidate(self, start: str, memo: dict[str, tuple[str, ...]], get_members: MembersGetter) -> None:
+		to_invalidate = [start]
+		while to_invalidate:
+			name = to_invalidate.pop()
+			if memo.pop(name, None) is not None:
+				to_invalidate.extend(get_members(name))
+
+	def node_added(self, name: str) -> None:
+		if not self.is_built:
+			return
+		if not any(self._get_parents(name)):
+			self._roots[name] = None
+		if not any(self._get_children(name)):
+			self._leaves[name] = None
+
+	def edge_added(self, parent: str, child: str) -> None:
+		if not self.is_built:
+			return
+		self._leaves.pop(parent, None)
+		self._roots.pop(child, None)
+		self._invalidate_edge(parent, child)
+
+	def edge_removed(self, parent: str, child: str) -> None:
+		if not self.is_built:
+			return
+		if not any(self._get_children(parent)):
+			self._leaves[parent] = None
+		if not any(self._get_parents(child)):
+			self._roots[child] = None
+		self._invalidate_edge(parent, child)
+
+	def _invalidate_edge(self, parent: str, child: str) -> None:
+		self._invalidate(child, self._final_ancestors, self._get_children)
+		self._invalidate(parent, self._final_descendants, self._get_parents)
+
+	def node_deleted(self, name: str) -> None:
+		for collection in (self._roots, self._leaves, self._final_ancestors, self._final_descendants):
+			collection.pop(name, None)
+
+	def node_renamed(self, old: str, new: str) -> None:
+		if not self.is_built:
+			return
+		for finals in (self._roots, self._leaves):
+			rename_key(finals, old, new)
+		for memo in (self._final_ancestors, self._final_descendants):
+			rename_key(memo, old, new)
+		self._invalidate(new, self._final_ancestors, self._get_children)
+		self._invalidate(new, self._final_descendants, self._get_parents)
+
+
+class PositionIndex(GraphIndex):
+	'''
+	The names by their position among all nodes, as the full listing numbers them.
+	A deletion shifts every later position, so it rebuilds on demand instead
+	'''
+
+	def __init__(self, get_parents: MembersGetter, get_children: MembersGetter):
+		super().__init__(get_parents, get_children)
+		self._names: list[str] = []
+
+	def build(self, adjacency: Adjacency) -> None:
+		self._names = [name for name, _ in adjacency]
+		super().build(adjacency)
+
+	def clear(self) -> None:
+		self._names = []
+		super().clear()
+
+	def get_name(self, position: int) -> str:
+		return self._names[position]
+
+	def node_added(self, name: str) -> None:
+		if self.is_built:
+			self._names.append(name)
+
+	def node_deleted(self, name: str) -> None:
+		if self.is_built:
+			self.clear()
+
+
+class Listing(GraphIndex):
+	'''
+	The names the last numbered output printed, by their numbers, so that the next commands point at the same nodes.
+	A deleted node keeps its number, which then resolves to nothing. Only short listings are kept, long ones just bar their numbers
+	'''
+	kept_size = 1000
+
+	def __init__(self, get_parents: MembersGetter, get_children: MembersGetter):
+		super().__init__(get_parents, get_children)
+		self._offset = 0
+		self._names: list[str | None] | None = []
+
+	def record(self, nodes: Iterable, offset: int = 0) -> Iterator:
+		self.clear()
+		self.is_built = True
+		self._offset = offset
+		for node in nodes:
+			if self._names is not None:
+				self._names.append(node.name)
+				if len(self._names) > self.kept_size:
+					self._names = None
+			yield node
+
+	def restore(self, offset: int, names: list[str | None] | None) -> None:
+		self.clear()
+		self._offset = offset
+		self._names = names
+		self.is_built = True
+
+	def get_kept(self) -> tuple[int, list[str | None] | None]:
+		return self._offset, self._names
+
+	def clear(self) -> None:
+		self._offset = 0
+		self._names = []
+		super().clear()
+
+	def get_name(self, number: int) -> str:
+		if self._names is None:
+			raise KeyError(f'The last listing had over {self.kept_size} nodes, so its numbers are not kept, list fewer with --limit')
+		position = number - self._offset - 1
+		if not 0 <= position < len(self._names):
+			raise KeyError(f'{number} is not in the last listing')
+		name = self._names[position]
+		if name is None:
+			raise KeyError(f'{number} points at a deleted node')
+		return name
+
+	def node_deleted(self, name: str) -> None:
+		if self._names and name in self._names:
+			self._names[self._names.index(name)] = None
+
+	def node_renamed(self, old: str, new: str) -> None:
+		if self._names and old in self._names:
+			self._names[self._names.index(old)] = new
+
+
+_anchored_literal = re.compile(r'\^([^.^$*+?{}\[\]\\|()]*)(\$?)')
+
+
+def get_anchored_literal(pattern: Pattern) -> tuple[str | None, bool]:
+	'''
+	Recognizes "^literal" and "^literal$" patterns, which resolve through a prefix range or a single lookup
+	'''
+	matched = _anchored_literal.fullmatch(pattern.pattern) if pattern.flags == re.UNICODE else None
+	if matched is None:
+		return None, False
+	return matched.group(1), bool(matched.group(2))
+
+
+class TrigramIndex:
+	'''
+	Texts by the trigrams they contain. Literals that a pattern requires narrow the texts down to its candidates
+	'''
+
+	def __init__(self):
+		self._texts: dict[str, None] = {}
+		self._postings: dict[str, set[str]] = {}
+
+	def __len__(self):
+		return len(self._texts)
+
+	def add(self, text: str) -> None:
+		if text in self._texts:
+			return
+		self._texts[text] = None
+		for trigram in self._get_trigrams(text):
+			self._postings.setdefault(trigram, set()).add(text)
+
+	def remove(self, text: str) -> None:
+		if text not in self._texts:
+			return
+		del self._texts[text]
+		for trigram in self._get_trigrams(text):
+			postings = self._postings[trigram]
+			postings.discard(text)
+			if not postings:
+				del self._postings[trigram]
+
+	@classmethod
+	def _get_trigrams(cls, text: str) -> set[str]:
+		return {text[i:i+3] for i in range(len(text) - 2)}
+
+	def get_candidates(self, pattern: Pattern) -> Iterable[str]:
+		if pattern.flags & re.IGNORECASE or not isinstance(pattern.pattern, str):
+			return self._texts.keys()
+		candidates = self._get_sequence_candidates(sre_parse.parse(pattern.pattern, pattern.flags))
+		return self._texts.keys() if candidates is None else candidates
+
+	def _get_sequence_candidates(self, items) -> set[str] | None:
+		'''
+		Intersects the candidates of every part the sequence requires, None standing for no restriction
+		'''
+		candidates, literal = None, []
+		for op, av in chain(items, [(None, None)]):
+			if op == sre_parse.LITERAL:
+				literal.append(chr(av))
+				continue
+			candidates = self._intersect(candidates, self._get_literal_candidates(''.join(literal)))
+			literal = []
+			if op == sre_parse.SUBPATTERN and not av[1] & re.IGNORECASE:
+				candidates = self._intersect(candidates, self._get_sequence_candidates(av[-1]))
+			elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+				candidates = self._intersect(candidates, self._get_sequence_candidates(av[2]))
+			elif op == sre_parse.BRANCH:
+				candidates = self._intersect(candidates, self._get_branch_candidates(av[1]))
+		return candidates
+
+	def _get_branch_candidates(self, branches) -> set[str] | None:
+		candidates = set()
+		for branch in branches:
+			branch_candidates = self._get_sequence_candidates(branch)
+			if branch_candidates is None:
+				return None
+			candidates |= branch_candidates
+		return candidates
+
+	def _get_literal_candidates(self, literal: str) -> set[str] | None:
+		if len(literal) < 3:
+			return None
+		all_postings = sorted((self._postings.get(trigram, set()) for trigram in self._get_trigrams(literal)), key=len)
+		return all_postings[0].intersection(*all_postings[1:])
+
+	@classmethod
+	def _intersect(cls, candidates: set[str] | None, to_intersect: set[str] | None) -> set[str] | None:
+		if candidates is None:
+			return to_intersect
+		if to_intersect is None:
+			return candidates
+		return candidates & to_intersect
+
+
+class AttributeIndex:
+	'''
+	Inverted index from attribute keys through their string values, or list elements, to the names of the nodes holding them
+	'''
+	def __init__(self):
+		self.is_built = False
+		self.use_trigrams = False
+		self._attributes: dict[str, dict[str, Any]] = {}
+		self._names_with: dict[str, dict[str, None]] = {}
+		self._names_by_value: dict[str, dict[str, dict[str, None]]] = {}
+		self._sorted_values: dict[str, list[str]] = {}
+		self._name_trigrams = TrigramIndex()
+		self._value_trigrams: dict[str, TrigramIndex] = {}
+
+	def build(self, items: Iterable[tuple[str, dict[str, Any]]], use_trigrams: bool = False) -> None:
+		self.clear()
+		self.is_built = True
+		self.use_trigrams = use_trigrams
+		for name, attributes in items:
+			self.update(name, attributes)
+
+	def clear(self) -> None:
+		self.is_built = False
+		self._attributes.clear()
+		self._names_with.clear()
+		self._names_by_value.clear()
+		self._sorted_values.clear()
+		self._name_trigrams = TrigramIndex()
+		self._value_trigrams.clear()
+
+	def update(self, name: str, attributes: dict[str, Any]) -> None:
+		if not self.is_built:
+			return
+		if name not in self._attributes and self.use_trigrams:
+			self._name_trigrams.add(name)
+		self._remove_attributes(name)
+		self._attributes[name] = attributes
+		for key, value in attributes.items():
+			self._names_with.setdefault(key, {})[name] = None
+			values = self._names_by_value.setdefault(key, {})
+			for element in self._get_searchable(value):
+				if element not in values:
+					values[element] = {}
+					self._sorted_values.pop(key, None)
+					if self.use_trigrams:
+						self._value_trigrams.setdefault(key, TrigramIndex()).add(element)
+				values[element][name] = None
+
+	def remove(self, name: str) -> None:
+		if not self.is_built:
+			return
+		self._remove_attributes(name)
+		self._attributes.pop(name, None)
+		self._name_trigrams.remove(name)
+
+	def _remove_attributes(self, name: str) -> None:
+		for key, value in self._attributes.get(name, {}).items():
+			self._names_with[key].pop(name)
+			values = self._names_by_value[key]
+			for element in self._get_searchable(value):
+				values[element].pop(name)
+				if not values[element]:
+					del values[element]
+					self._sorted_values.pop(key, None)
+					if key in self._value_trigrams:
+						self._value_trigrams[key].remove(element)
+
+	@classmethod
+	def _get_searchable(cls, value) -> Iterable[str]:
+		elements = value if isinstance(value, list) else [value]
+		return dict.fromkeys(element for element in elements if isinstance(element, str))
+
+	def find_names_by_name(self, pattern: Pattern) -> set[str]:
+		literal, is_exact = get_anchored_literal(pattern)
+		if is_exact:
+			return {literal} & self._attributes.keys()
+		candidates = self._name_trigrams.get_candidates(pattern) if self.use_trigrams else self._attributes
+		return {name for name in candidates if pattern.search(name)}
+
+	def find_names_by_value(self, key: str, pattern: Pattern) -> set[str]:
+		values = self._names_by_value.get(key, {})
+		found = set()
+		for value in self._get_matching_values(key, values, pattern):
+			found.update(values[value])
+		return found
+
+	def find_names_with(self, key: str) -> set[str]:
+		return set(self._names_with.get(key, ()))
+
+	def find_names_without(self, key: str) -> set[str]:
+		return self._attributes.keys() - self._names_with.get(key, {}).keys()
+
+	def count_names(self) -> int:
+		return len(self._attributes)
+
+	def estimate_names_by_name(self, pattern: Pattern) -> int:
+		literal, is_exact = get_anchored_literal(pattern)
+		if is_exact:
+			return int(literal in self._attributes)
+		if self.use_trigrams:
+			return len(self._name_trigrams.get_candidates(pattern))
+		return self.count_names()
+
+	def estimate_names_by_value(self, key: str, pattern: Pattern) -> int:
+		values = self._names_by_value.get(key, {})
+		literal, is_exact = get_anchored_literal(pattern)
+		if literal is not None:
+			candidates = self._get_matching_values(key, values, pattern)
+		elif self.use_trigrams:
+			candidates = self._value_trigrams.get(key, TrigramIndex()).get_candidates(pattern)
+		else:
+			return self.estimate_names_with(key)
+		return min(sum(len(values[value]) for value in candidates), self.estimate_names_with(key))
+
+	def estimate_names_with(self, key: str) -> int:
+		return len(self._names_with.get(key, ()))
+
+	def _get_matching_values(self, key: str, values: dict[str, dict[str, None]], pattern: Pattern) -> Iterable[str]:
+		literal, is_exact = get_anchored_literal(pattern)
+		if literal is None:
+			candidates = self._value_trigrams.get(key, TrigramIndex()).get_candidates(pattern) if self.use_trigrams else values
+			return [value for value in candidates if pattern.search(value)]
+		if is_exact:
+			return [literal] if literal in values else []
+		if key not in self._sorted_values:
+			self._sorted_values[key] = sorted(values)
+		sorted_values = self._sorted_values[key]
+		start = bisect_left(sorted_values, literal)
+		return list(takewhile(lambda value: value.startswith(literal), islice(sorted_values, start, None)))
@@ -1,22 +1,66 @@
 #!/usr/bin/python
 from __future__ import annotations
 
+import os
 import sys
 from shlex import shlex
 
-from categorierCli import CategorierCli
-from nodes import NodesManager, Paths
+import client
 
 
 def main():
     in_debug = False
+    args = sys.argv
     if not in_debug:
-        args = sys.argv
-        NodesManager.load_data(Paths.DATABASE)
+        if client.DAEMON_FLAG in args:
+            return serve()
+        if client.STOP_DAEMON_FLAG in args:
+            return client.stop_daemon()
+        if args[1:2] == [client.BATCH_KEYWORD]:
+            return run_batch(args[2:])
+        response = client.run_command(args, on_line=print)
+        if response is not None:
+            return print_response(response)
+        run_locally(args)
     else:
-        NodesManager.load_data(Paths.RESOURCES / 'debug.yml')
-        args = get_args_for_test()
+        run_locally(get_args_for_test(), debug=True)
 
+
+def serve():
+    from daemon import Daemon  # kept out of the client path, which only needs the socket
+    Daemon().serve()
+
+
+def run_batch(args):
+    from batch import BatchRunner, DaemonBatchRunner, parse_batch_args
+    from categorierCli import CategorierCli
+    from nodes import NodesManager, Paths
+
+    path, save_every = parse_batch_args(args)
+    if client.is_daemon_running():
+        runner = DaemonBatchRunner(save_every)
+    else:
+        NodesManager.load_data(Paths.get_database())
+        runner = BatchRunner(CategorierCli(), save_every)
+    with open(path) if path else sys.stdin as lines:
+        summary = runner.run(lines)
+    print(f'{summary.executed} commands, {len(summary.errors)} failed', file=sys.stderr)
+    if summary.errors:
+        sys.exit(1)
+
+
+def print_response(response: dict):
+    error = response['error'] if response else client.DAEMON_DISCONNECTED
+    if error:
+        print(error, file=sys.stderr)
+        sys.exit(1)
+
+
+def run_locally(args, debug=False):
+    from categorierCli import CategorierCli
+    from nodes import NodesManager, Paths
+
+    NodesManager.load_data(Paths.RESOURCES / 'debug.yml' if debug else Paths.get_database())
     cli = CategorierCli()
     cli.parse(args)
     NodesManager.save_data()
@@ -27,4 +71,8 @@ def get_args_for_test():
 
 
 if __name__ == '__main__':
-    main()
+    try:
+        main()
+    except BrokenPipeError:  # the reader of a pipe, e.g. head, stopped early
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
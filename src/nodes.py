@@ -1,23 +1,28 @@
 from __future__ import annotations
 
-import operator as op
 import re
-from abc import ABC
-from dataclasses import dataclass
-from functools import reduce
-from itertools import repeat, chain
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from itertools import repeat, chain, islice
 from pathlib import Path
-from typing import Iterable, Pattern, Callable
-
-import yaml
+from typing import Iterable, Iterator, Callable
 
 from exceptions import NodeExistsInDataBase
+from graph import CompactGraph
+from indexes import GraphIndex, ClosureIndex, TopologicalOrderIndex, FinalMembersIndex, PositionIndex, Listing, AttributeIndex, get_cycle_names
+from search import Predicate, QueryPlan, QueryPlanner, search_in_parallel
+from storage import ListingFile, StorageBackend, YamlBackend, SqliteBackend
 
 
 @dataclass(frozen=True)
 class Paths:
 	RESOURCES = Path(__file__).parent.parent / 'resources'
 	DATABASE = RESOURCES / 'data.yml'
+	SQLITE_DATABASE = RESOURCES / 'data.db'
+
+	@classmethod
+	def get_database(cls) -> Path:
+		return cls.SQLITE_DATABASE if cls.SQLITE_DATABASE.exists() else cls.DATABASE
 
 
 @dataclass(frozen=True)
@@ -25,31 +30,91 @@ class MemberTypes:
 	PARENTS = 'parents'
 	CHILDREN = 'children'
 	DESCRIPTIONS = 'descriptions'
+	ALL = (PARENTS, CHILDREN, DESCRIPTIONS)
 
 	@classmethod
 	def get_opposite_type(cls, further_type: str) -> str:
 		return MemberTypes.PARENTS if further_type == MemberTypes.CHILDREN else MemberTypes.CHILDREN
 
 
+@dataclass
+class ImportSummary:
+	added: int = 0
+	edges: int = 0
+	duplicates: list[str] = field(default_factory=list)
+	missing: list[str] = field(default_factory=list)
+	cycle: list[str] = field(default_factory=list)  # when set, nothing was imported
+
+	@property
+	def is_imported(self) -> bool:
+		return not self.cycle
+
+
 class DataManager:
 	_data = {}
 	_loaded_path = None
+	_backend: StorageBackend = None
+	_has_changes = False
+
+	backends = {
+		'.db': SqliteBackend,
+		'.sqlite': SqliteBackend,
+		'.sqlite3': SqliteBackend,
+	}
 
 	@classmethod
 	def save_data(cls):
-		with open(cls._loaded_path, 'w') as data_file:
-			yaml.safe_dump(cls._data, data_file,
-						   default_flow_style=False,
-						   sort_keys=False,
-						   allow_unicode=True)
+		if not cls._has_changes:
+			return
+		cls._backend.save(cls._data)
+		cls._has_changes = False
+
+	@classmethod
+	def compact_data(cls):
+		cls._backend.compact(cls._data)
+		cls._has_changes = False
+
+	@classmethod
+	def has_changes(cls) -> bool:
+		return cls._has_changes
+
+	@classmethod
+	def _mark_changed(cls, name: str):
+		cls._backend.mark_changed(name)
+		cls._has_changes = True
+
+	@classmethod
+	def _mark_deleted(cls, name: str):
+		cls._backend.mark_deleted(name)
+		cls._has_changes = True
 
 	@classmethod
 	def load_data(cls, path: str | Path = None):
 		Paths.RESOURCES.mkdir(exist_ok=True)
-		cls._loaded_path = path or Paths.DATABASE
+		cls._loaded_path = Path(path or Paths.DATABASE)
 		cls._loaded_path.touch(exist_ok=True)
-		with open(cls._loaded_path, 'r+') as data_file:
-			cls._data = yaml.safe_load(data_file) or {}
+		if cls._backend is not None:
+			cls._backend.close()
+		cls._backend = cls.backends.get(cls._loaded_path.suffix, YamlBackend)(cls._loaded_path)
+		cls._data = cls._backend.load()
+		cls._has_changes = False
+
+	@classmethod
+	def reload_data(cls):
+		'''
+		Drops the unsaved changes
+		'''
+		cls.load_data(cls._loaded_path)
+
+	@classmethod
+	def convert_data(cls, path: str | Path):
+		cls.save_data()
+		items = list(cls._data.items())
+		cls.load_data(path)
+		for name, data in items:
+			cls._data[name] = data
+			cls._mark_changed(name)
+		cls.compact_data()
 
 
 class NodesManager(DataManager):
@@ -62,11 +127,153 @@ class NodesManager(DataManager):
 		NONE = 'none'
 
 	_active_nodes = dict()
+	_dirty_names = dict()
+
+	use_closure_index = False
+	use_topological_index = False
+	use_final_members_index = False
+	use_compact_graph = False
+	use_attribute_index = False
+	use_trigram_index = False
+	use_parallel_search = False
+	parallel_search_threshold = 100_000
+	parallel_search_workers: int | None = None
+	_closure_index: ClosureIndex = None
+	_topological_index: TopologicalOrderIndex = None
+	_final_members_index: FinalMembersIndex = None
+	_compact_graph: CompactGraph = None
+	_position_index: PositionIndex = None
+	_listing: Listing = None
+	_listing_file: ListingFile = None
+	_attribute_index: AttributeIndex = None
+	_indexes: list[GraphIndex] = []
 
 	@classmethod
 	def load_data(cls, path: str | Path = None):
 		cls._active_nodes.clear()
+		cls._dirty_names.clear()
 		super().load_data(path)
+		cls._listing = Listing(cls.get_parent_names, cls.get_child_names)  # not derived from the data, so rebuilding the indexes keeps it
+		cls._listing_file = ListingFile(cls._loaded_path)
+		kept = cls._listing_file.load()
+		if kept is not None:
+			cls._listing.restore(*kept)
+		cls._create_indexes()
+
+	@classmethod
+	def _create_indexes(cls):
+		members_getters = cls.get_parent_names, cls.get_child_names
+		cls._closure_index = ClosureIndex(*members_getters)
+		cls._topological_index = TopologicalOrderIndex(*members_getters)
+		cls._final_members_index = FinalMembersIndex(*members_getters)
+		cls._compact_graph = CompactGraph(*members_getters)
+		cls._position_index = PositionIndex(*members_getters)
+		cls._indexes = [cls._closure_index, cls._topological_index, cls._final_members_index, cls._compact_graph, cls._position_index, cls._listing]
+		cls._attribute_index = AttributeIndex()
+
+	@classmethod
+	def get_closure_index(cls) -> ClosureIndex | None:
+		if not cls.use_closure_index:
+			return None
+		if not cls._closure_index.is_built:
+			cls._closure_index.build(cls._get_adjacency())
+		return cls._closure_index
+
+	@classmethod
+	def get_topological_index(cls) -> TopologicalOrderIndex | None:
+		if not cls.use_topological_index:
+			return None
+		if not cls._topological_index.is_built:
+			cls._topological_index.build(cls._get_adjacency())
+		return cls._topological_index
+
+	@classmethod
+	def get_final_members_index(cls) -> FinalMembersIndex | None:
+		if not cls.use_final_members_index:
+			return None
+		if not cls._final_members_index.is_built:
+			cls._final_members_index.build(cls._get_adjacency())
+		return cls._final_members_index
+
+	@classmethod
+	def get_compact_graph(cls) -> CompactGraph | None:
+		if not cls.use_compact_graph:
+			return None
+		if not cls._compact_graph.is_built:
+			cls._compact_graph.build(cls._get_adjacency())
+		return cls._compact_graph
+
+	@classmethod
+	def get_attribute_index(cls) -> AttributeIndex | None:
+		if not cls.use_attribute_index and not cls.use_trigram_index:
+			return None
+		if not cls._attribute_index.is_built or cls._attribute_index.use_trigrams != cls.use_trigram_index:
+			items = ((name, cls._get_attributes(data)) for name, data in cls.get_data().items())
+			cls._attribute_index.build(items, use_trigrams=cls.use_trigram_index)
+		return cls._attribute_index
+
+	@classmethod
+	def _get_attributes(cls, data: dict) -> dict:
+		return {key: value for key, value in data.items() if key not in (MemberTypes.PARENTS, MemberTypes.CHILDREN)}
+
+	@classmethod
+	def get_root_names(cls) -> Iterable[str]:
+		final_members_index = cls.get_final_members_index()
+		if final_members_index is not None:
+			return list(final_members_index.get_roots())
+		return [name for name in cls.get_all_names() if not cls.get_parent_names(name)]
+
+	@classmethod
+	def get_leaf_names(cls) -> Iterable[str]:
+		final_members_index = cls.get_final_members_index()
+		if final_members_index is not None:
+			return list(final_members_index.get_leaves())
+		return [name for name in cls.get_all_names() if not cls.get_child_names(name)]
+
+	@classmethod
+	def _get_adjacency(cls) -> Iterable[tuple[str, list[str]]]:
+		return ((name, data.get(MemberTypes.CHILDREN, [])) for name, data in cls.get_data().items())
+
+	@classmethod
+	def on_edge_added(cls, parent: str, child: str):
+		for index in cls._indexes:
+			index.edge_added(parent, child)
+
+	@classmethod
+	def on_edge_removed(cls, parent: str, child: str):
+		for index in cls._indexes:
+			index.edge_removed(parent, child)
+
+	@classmethod
+	def get_member_names(cls, name: str, further_type: str) -> list[str]:
+		try:
+			return cls._active_nodes[name].get_further(further_type).get_names()
+		except KeyError:
+			return cls._data.get(name, {}).get(further_type, [])
+
+	@classmethod
+	def get_parent_names(cls, name: str) -> list[str]:
+		return cls.get_member_names(name, MemberTypes.PARENTS)
+
+	@classmethod
+	def get_child_names(cls, name: str) -> list[str]:
+		return cls.get_member_names(name, MemberTypes.CHILDREN)
+
+	@classmethod
+	def has_changes(cls) -> bool:
+		return bool(cls._dirty_names) or super().has_changes()
+
+	@classmethod
+	def save_data(cls):
+		cls._flush_active_nodes()
+		super().save_data()
+		if cls._listing.is_built:
+			cls._listing_file.store(*cls._listing.get_kept())
+
+	@classmethod
+	def compact_data(cls):
+		cls._flush_active_nodes()
+		super().compact_data()
 
 	@classmethod
 	def get_node(cls, name: str) -> Node:
@@ -96,8 +303,30 @@ class NodesManager(DataManager):
 		return cls._data.keys()
 
 	@classmethod
-	def get_all_nodes(cls) -> Iterable[Node]:
-		return map(cls.get_node, cls.get_all_names())
+	def get_all_nodes(cls, offset: int = 0, limit: int = None) -> Iterable[Node]:
+		return map(cls.get_node, cls._get_page(cls.get_all_names(), offset, limit))
+
+	@classmethod
+	def record_listing(cls, nodes: Iterable[Node], offset: int = 0) -> Iterable[Node]:
+		return cls._listing.record(nodes, offset)
+
+	@classmethod
+	def get_name_by_number(cls, number: int) -> str:
+		'''
+		The node the last listing printed with the number. The listing is saved with the data, so the daemon and separate runs agree.
+		Only before anything was ever listed do numbers count positions among all nodes
+		'''
+		if cls._listing.is_built:
+			return cls._listing.get_name(number)
+		if not cls._position_index.is_built:
+			cls._position_index.build(cls._get_adjacency())
+		return cls._position_index.get_name(number - 1)
+
+	@classmethod
+	def _get_page(cls, names: Iterable[str], offset: int = 0, limit: int = None) -> Iterable[str]:
+		if not offset and limit is None:
+			return names
+		return islice(names, offset, None if limit is None else offset + limit)
 
 	@classmethod
 	def _get_node_from_data(cls, name: str) -> Node:
@@ -111,7 +340,9 @@ class NodesManager(DataManager):
 		node = Node(name)
 		node.parents = data.get(MemberTypes.PARENTS, tuple())
 		node.children = data.get(MemberTypes.CHILDREN, tuple())
-		node.descriptions = data.get(MemberTypes.DESCRIPTIONS, tuple())
+		if data.get(MemberTypes.DESCRIPTIONS):  # left out otherwise, reading them creates the list
+			node.descriptions = data[MemberTypes.DESCRIPTIONS]
+		dict.update(node, ((key, node.track(value)) for key, value in data.items() if key not in MemberTypes.ALL))
 		cls._active_nodes[name] = node
 		return node
 
@@ -143,25 +374,157 @@ class NodesManager(DataManager):
 		return node
 
 	@classmethod
-	def save_node(cls, node: Node | str):
+	def import_nodes(cls, records: Iterable[tuple[str, dict]]) -> ImportSummary:
+		'''
+		Adds the records and the edges they name in one go, skipping the names already present.
+		The whole batch is checked for cycles once and rejected as a whole if it would close one
+		'''
+		cls.save_active_nodes()
+		summary = ImportSummary()
+		staged: dict[str, dict] = {}
+		edges = {}
+		for name, data in records:
+			if name in cls._data or name in staged:
+				summary.duplicates.append(name)
+				continue
+			data = dict(data)
+			edges.update(((parent, name), None) for parent in data.pop(MemberTypes.PARENTS, ()))
+			edges.update(((name, child), None) for child in data.pop(MemberTypes.CHILDREN, ()))
+			staged[name] = data
+
+		is_known = lambda name: name in staged or name in cls._data
+		summary.missing = list(dict.fromkeys(name for edge in edges for name in edge if not is_known(name)))
+		edges = [edge for edge in edges if is_known(edge[0]) and is_known(edge[1])]
+		added_children = {}
+		for parent, child in edges:
+			added_children.setdefault(parent, []).append(child)
+		adjacency = ((name, chain(cls._data.get(name, {}).get(MemberTypes.CHILDREN, ()), added_children.get(name, ()))) for name in chain(cls._data, staged))
+		summary.cycle = sorted(get_cycle_names(adjacency))
+		if summary.cycle:
+			return summary
+
+		cls._add_imported(staged, edges)
+		summary.added, summary.edges = len(staged), len(edges)
+		return summary
+
+	@classmethod
+	def _add_imported(cls, staged: dict[str, dict], edges: list[tuple[str, str]]):
+		members = {}
+		for parent, child in edges:
+			members.setdefault(child, ({}, {}))[0][parent] = None
+			members.setdefault(parent, ({}, {}))[1][child] = None
+		for name in chain(staged, members.keys() - staged.keys()):
+			data = staged[name] if name in staged else cls._data[name]
+			parents, children = members.get(name, ((), ()))
+			parents = [*data.get(MemberTypes.PARENTS, ()), *parents]
+			children = [*data.get(MemberTypes.CHILDREN, ()), *children]
+			attributes = {key: value for key, value in data.items() if key not in (MemberTypes.PARENTS, MemberTypes.CHILDREN) and value}
+			cls._data[name] = {
+				**({MemberTypes.PARENTS: parents} if parents else {}),
+				**({MemberTypes.CHILDREN: children} if children else {}),
+				**attributes,
+			}
+			cls._mark_changed(name)
+		cls._create_indexes()  # cheaper to rebuild on demand than to replay every edge
+
+	@classmethod
+	def save_node(cls, node: Node):
+		if node.name in cls._dirty_names and cls._active_nodes[node.name] is node:
+			return
 		cls._active_nodes[node.name] = node
-		cls._data |= node.to_dict()
+		cls._dirty_names[node.name] = None
+		if node.name not in cls._data:
+			cls._data[node.name] = {}  # reserves the position until the flush
+			for index in cls._indexes:
+				index.node_added(node.name)
+
+	@classmethod
+	def mark_node_changed(cls, node: Node):
+		if cls._active_nodes.get(node.name) is node:
+			cls._dirty_names[node.name] = None
 
 	@classmethod
 	def save_active_nodes(cls):
-		update_dict = reduce(op.or_, map(Node.to_dict, cls._active_nodes.values()), {})
-		cls._data.update(update_dict)
+		cls._flush_active_nodes()
 		cls._active_nodes.clear()
 
+	@classmethod
+	def _flush_active_nodes(cls):
+		for name in cls._dirty_names:
+			cls._data[name] = data = cls._active_nodes[name].to_data()
+			cls._attribute_index.update(name, cls._get_attributes(data))
+			cls._mark_changed(name)
+		cls._dirty_names.clear()
+
 	@classmethod
 	def delete_node(cls, node: Node | str):
-		node = cls._get_node_from_all(node)
-		parents = node.parents.names
-		children = node.children.names
-		node.remove_parents(*parents)
-		node.remove_children(*children)
-		cls._active_nodes.pop(node.name)
-		cls._data.pop(node.name)
+		cls.delete_nodes(node)
+
+	@classmethod
+	def delete_nodes(cls, *nodes: Node | str):
+		'''
+		Removes the edges to the surviving neighbours with a single change per neighbour's members.
+		Everything that can fail is looked up before anything changes
+		'''
+		names = list(dict.fromkeys(map(cls._get_name_from_all, nodes)))
+		for name in names:
+			if cls.is_not_in_data(name):
+				raise KeyError(name)
+		deleted = set(names)
+		detached: dict[tuple[str, str], list[str]] = {}
+		edges: list[tuple[str, str]] = []
+		for name in names:
+			for further_type in (MemberTypes.PARENTS, MemberTypes.CHILDREN):
+				opposite_type = MemberTypes.get_opposite_type(further_type)
+				for member in cls.get_member_names(name, further_type):
+					if member in deleted:
+						continue
+					detached.setdefault((member, opposite_type), []).append(name)
+					edges.append((member, name) if further_type == MemberTypes.PARENTS else (name, member))
+		fields = [(cls.get_node(member).get_further(further_type), to_removes) for (member, further_type), to_removes in detached.items()]
+
+		for further, to_removes in fields:
+			further.remove(*to_removes)
+		for name in names:
+			cls._active_nodes.pop(name, None)
+			cls._dirty_names.pop(name, None)
+			del cls._data[name]
+			cls._mark_deleted(name)
+		for edge in edges:
+			cls.on_edge_removed(*edge)
+		for name in names:
+			for index in cls._indexes:
+				index.node_deleted(name)
+			cls._attribute_index.remove(name)
+
+	@classmethod
+	def rename_node(cls, old: str, new: str) -> Node:
+		'''
+		Rewrites only the node's neighbours, found through its own members.
+		Everything that can fail is looked up before anything changes
+		'''
+		if cls.is_in_data(new):
+			raise NodeExistsInDataBase(new)
+		node = cls.get_node(old)
+		parents = list(cls.get_nodes(*node.parents.names))
+		children = list(cls.get_nodes(*node.children.names))
+
+		for parent in parents:
+			parent.children.replace(old, new)
+		for child in children:
+			child.parents.replace(old, new)
+		del cls._active_nodes[old]
+		cls._dirty_names.pop(old, None)
+		del cls._data[old]
+		cls._mark_deleted(old)
+		node.name = new
+		cls._active_nodes[new] = node
+		cls._dirty_names[new] = None
+		cls._data[new] = {}  # reserves the position until the flush
+		for index in cls._indexes:
+			index.node_renamed(old, new)
+		cls._attribute_index.remove(old)
+		return node
 
 	@classmethod
 	def is_in_data(cls, name: str) -> bool:
@@ -173,36 +536,48 @@ class NodesManager(DataManager):
 
 	@classmethod
 	def get_data(cls) -> dict:
+		cls._flush_active_nodes()
 		return cls._data
 
 	@classmethod
-	def search_node(cls, criteria: Iterable, arguments: Iterable, func: Callable=None):
+	def search_node(cls, criteria: Iterable, arguments: Iterable, func: Callable=None, *, offset: int = 0, limit: int = None, parallel: bool = None):
+		plan = cls.plan_search(criteria, arguments, func)
+		searcher = cls._get_searcher()
+		if searcher is not None:
+			cls._flush_active_nodes()
+		if not plan.lookups and cls._should_search_in_parallel(parallel):
+			ignored_keys = (MemberTypes.PARENTS, MemberTypes.CHILDREN)
+			found_names = search_in_parallel(cls.get_data().items(), plan.checks, plan.is_union, ignored_keys, cls.parallel_search_workers)
+		else:
+			found_names = plan.execute(cls.get_all_names(), searcher, cls._verify_predicate)
+		return map(cls.get_node, cls._get_page(found_names, offset, limit))
+
+	@classmethod
+	def _should_search_in_parallel(cls, parallel: bool = None) -> bool:
+		if parallel is None:
+			parallel = cls.use_parallel_search
+		return parallel and len(cls._data) >= cls.parallel_search_threshold
+
+	@classmethod
+	def plan_search(cls, criteria: Iterable, arguments: Iterable, func: Callable=None) -> QueryPlan:
 		K = cls.SOME_KEYWORDS
-		patterns = map(lambda a: re.compile(a) if a != K.NONE else K.NONE, arguments)
-		condition = cls._get_search_condition(criteria, patterns, func)
-		found = filter(condition, map(NodesManager.get_node, NodesManager.get_all_names()))
-		return found
+		predicates = [Predicate(criterion, re.compile(argument) if argument != K.NONE else None, criterion == K.MEMO) for criterion, argument in zip(criteria, arguments)]
+		if func is None:
+			predicates = predicates[:1]
+		return QueryPlanner(cls._get_searcher()).plan(predicates, func)
 
 	@classmethod
-	def _get_search_condition(cls, criteria: Iterable[str], patterns: Iterable[Pattern], func: Callable):
-		criteria = list(criteria)
-		patterns = list(patterns)
-		if func is not None:
-			return lambda node: func((cls._verify_criterion(criterion, pattern, node) for criterion, pattern in zip(criteria, patterns)))
-		else:
-			return lambda node: cls._verify_criterion(criteria[0], patterns[0], node)
+	def _get_searcher(cls) -> AttributeIndex | StorageBackend | None:
+		attribute_index = cls.get_attribute_index()
+		if attribute_index is not None:
+			return attribute_index
+		if cls._backend.supports_search:
+			return cls._backend
+		return None
 
 	@classmethod
-	def _verify_criterion(cls, criterion, pattern, node):
-		try:
-			return bool(pattern.search(node.get(criterion)))
-		except KeyError:
-			if criterion == cls.SOME_KEYWORDS.MEMO:
-				return bool(pattern.search(node.name))
-		except AttributeError:
-			if pattern == cls.SOME_KEYWORDS.NONE:
-				return criterion not in node
-		return False
+	def _verify_predicate(cls, name: str, predicate: Predicate) -> bool:
+		return predicate.matches(name, cls.get_node(name))
 
 #########
 # Nodes #
@@ -210,11 +585,15 @@ class NodesManager(DataManager):
 
 
 class IToDict:
+	__slots__ = ()
+
 	def to_dict(self):
 		raise NotImplementedError
 
 
 class IName:
+	__slots__ = ()  # the classes using it hold the name, so that Node can still be a dict
+
 	def __init__(self, name: str, **kwargs):
 		super().__init__(**kwargs)
 		self.name = name
@@ -224,6 +603,8 @@ class IName:
 
 
 class Field(IName, IToDict):
+	__slots__ = ('name',)
+
 	def __init__(self, name, **kwargs):
 		super().__init__(name=name, **kwargs)
 
@@ -232,28 +613,44 @@ class Field(IName, IToDict):
 
 
 class CollectiveField(Field):
-	def __init__(self, name, values=None, **kwargs):
+	__slots__ = ('_values', '_owner')
+
+	def __init__(self, name, values=None, owner: NodesStorageFieldPossessor = None, **kwargs):
 		super().__init__(name=name, **kwargs)
-		self._values = values or []
+		self._values = OrderedSet(values) if values else NO_MEMBERS
+		self._owner = owner
 
 	def to_dict(self) -> dict:
-		return {self.name: self._values} if self._values else {}
+		return {self.name: list(self._values)} if self._values else {}
+
+	def _notify(self) -> None:
+		if self._owner is not None:
+			self._owner.mark_changed()
 
 	def get_nth(self, n: int):
 		return self._values[n]
 
 	def add(self, *to_adds) -> None:
+		if self._values is NO_MEMBERS:
+			self._values = OrderedSet()
 		self._values.extend(to_adds)
+		self._notify()
 
 	def remove(self, *to_removes):
 		for to_remove in to_removes:
 			self._values.remove(to_remove)
+		self._notify()
+
+	def replace(self, old, new) -> None:
+		self._values.replace(old, new)
+		self._notify()
 
 	def get_all(self) -> list:
-		return self._values
+		return list(self._values)
 
 	def clear(self):
-		self.remove(*self.get_all())
+		self._values = NO_MEMBERS
+		self._notify()
 
 	def is_empty(self) -> bool:
 		return len(self) == 0
@@ -272,41 +669,103 @@ class CollectiveField(Field):
 
 
 class NodesStorageField(CollectiveField, ABC):
+	__slots__ = ()
 
 	def __init__(self, *names: str, name: str = None, **kwargs):
 		super().__init__(name=name, values=names, **kwargs)
 
 	def get_all_member_names_flattened(self) -> Iterable[str]:
+		closure_index = NodesManager.get_closure_index()
+		if closure_index is not None:
+			return iter(list(self._get_indexed_closure(closure_index)))
+		compact_graph = NodesManager.get_compact_graph()
+		if compact_graph is not None:
+			return self._get_compact_closure(compact_graph)
+		return self._walk_member_names()
+
+	@abstractmethod
+	def _get_indexed_closure(self, closure_index: ClosureIndex) -> Iterable[str]:
+		raise NotImplementedError
+
+	@abstractmethod
+	def _get_compact_closure(self, compact_graph: CompactGraph) -> Iterable[str]:
+		raise NotImplementedError
+
+	def _walk_member_names(self) -> Iterable[str]:
 		yold = set()
-		to_extend = self._values[:]
+		to_extend = list(self._values)
 		while to_extend:
 			name = to_extend.pop()
 			if name not in yold:
 				yold.add(name)
-				node = NodesManager.get_node(name)
-				further = node.get_further(self.name).get_all()
-				to_extend.extend(further)
+				to_extend.extend(NodesManager.get_member_names(name, self.name))
 				yield name
 
+	def get_all_member_names_within(self, depth: int) -> Iterator[str]:
+		'''
+		Breadth first, so the nearest members come first and nothing past the depth is visited
+		'''
+		yold = set()
+		level = list(self._values)
+		for _ in range(depth):
+			next_level = []
+			for name in level:
+				if name not in yold:
+					yold.add(name)
+					yield name
+					next_level.extend(NodesManager.get_member_names(name, self.name))
+			level = next_level
+
 	@property
 	def names(self) -> Iterable[str]:
-		return self._values[:]
+		return list(self._values)
 
 	def get_names(self) -> Iterable[str]:
 		return self._values
 
 	def has_in_flattened_members(self, to_check: str):
+		closure_index = NodesManager.get_closure_index()
+		if closure_index is not None:
+			return to_check in self._get_indexed_closure(closure_index)
+		topological_index = NodesManager.get_topological_index()
+		if topological_index is not None:
+			return to_check != self._owner.name and self._is_reachable(topological_index, to_check)
 		return to_check in self.get_all_member_names_flattened()
 
+	@abstractmethod
+	def _is_reachable(self, topological_index: TopologicalOrderIndex, to_check: str) -> bool:
+		raise NotImplementedError
+
 	def get_final_members(self) -> Iterable[str]:
-		to_extend = self._values[:]
+		final_members_index = NodesManager.get_final_members_index()
+		if final_members_index is not None:
+			return iter(self._get_indexed_final_members(final_members_index))
+		compact_graph = NodesManager.get_compact_graph()
+		if compact_graph is not None:
+			return self._get_compact_final_members(compact_graph)
+		return self._walk_final_member_names()
+
+	@abstractmethod
+	def _get_indexed_final_members(self, final_members_index: FinalMembersIndex) -> Iterable[str]:
+		raise NotImplementedError
+
+	@abstractmethod
+	def _get_compact_final_members(self, compact_graph: CompactGraph) -> Iterable[str]:
+		raise NotImplementedError
+
+	def _walk_final_member_names(self) -> Iterable[str]:
+		visited = set()
+		to_extend = list(reversed(self._values))
 		while to_extend:
 			name = to_extend.pop()
-			node = NodesManager.get_node(name)
-			if not len(node.parents):
-				yield name
+			if name in visited:
+				continue
+			visited.add(name)
+			further = NodesManager.get_member_names(name, self.name)
+			if further:
+				to_extend.extend(reversed(further))
 			else:
-				to_extend.extend(node.parents.get_all())
+				yield name
 
 	def get_node(self, name: str) -> Node:
 		if name in self._values:
@@ -327,21 +786,59 @@ class NodesStorageField(CollectiveField, ABC):
 
 
 class ParentNodesStorageField(NodesStorageField):
+	__slots__ = ()
+
 	def __init__(self, *parents: str, **kwargs):
 		super().__init__(*parents, name=MemberTypes.PARENTS, **kwargs)
 
+	def _get_indexed_closure(self, closure_index: ClosureIndex) -> Iterable[str]:
+		return closure_index.get_ancestors(self._owner.name)
+
+	def _is_reachable(self, topological_index: TopologicalOrderIndex, to_check: str) -> bool:
+		return topological_index.reaches(to_check, self._owner.name)
+
+	def _get_indexed_final_members(self, final_members_index: FinalMembersIndex) -> Iterable[str]:
+		return final_members_index.get_final_ancestors(self._owner.name)
+
+	def _get_compact_closure(self, compact_graph: CompactGraph) -> Iterable[str]:
+		return compact_graph.get_ancestors(self._owner.name)
+
+	def _get_compact_final_members(self, compact_graph: CompactGraph) -> Iterable[str]:
+		return compact_graph.get_final_ancestors(self._owner.name)
+
 
 class ChildNodesStorageField(NodesStorageField):
+	__slots__ = ()
+
 	def __init__(self, *parents: str, **kwargs):
 		super().__init__(*parents, name=MemberTypes.CHILDREN, **kwargs)
 
+	def _get_indexed_closure(self, closure_index: ClosureIndex) -> Iterable[str]:
+		return closure_index.get_descendants(self._owner.name)
+
+	def _is_reachable(self, topological_index: TopologicalOrderIndex, to_check: str) -> bool:
+		return topological_index.reaches(self._owner.name, to_check)
+
+	def _get_indexed_final_members(self, final_members_index: FinalMembersIndex) -> Iterable[str]:
+		return final_members_index.get_final_descendants(self._owner.name)
+
+	def _get_compact_closure(self, compact_graph: CompactGraph) -> Iterable[str]:
+		return compact_graph.get_descendants(self._owner.name)
+
+	def _get_compact_final_members(self, compact_graph: CompactGraph) -> Iterable[str]:
+		return compact_graph.get_final_descendants(self._owner.name)
+
 
 class NodesStorageFieldPossessor(IName):
+	__slots__ = ()
 
 	def __init__(self, name, **kwargs):
 		super().__init__(name, **kwargs)
-		self.parents = ParentNodesStorageField()
-		self.children = ChildNodesStorageField()
+		self.parents = ParentNodesStorageField(owner=self)
+		self.children = ChildNodesStorageField(owner=self)
+
+	def mark_changed(self) -> None:
+		pass
 
 	# Nodes storages:
 
@@ -382,11 +879,11 @@ class NodesStorageFieldPossessor(IName):
 		if not to_put:
 			return
 		further = self.get_further(further_type)
-		if to_put in further.names:
+		if to_put in further:
 			return None
-		opposite_type = MemberTypes.PARENTS if further_type == MemberTypes.CHILDREN else MemberTypes.CHILDREN
+		opposite_type = MemberTypes.get_opposite_type(further_type)
 		opposite = self.get_further(opposite_type)
-		if opposite.has_in_flattened_members(to_put):
+		if to_put == self.name or opposite.has_in_flattened_members(to_put):
 			raise ValueError
 
 		further.add(to_put)
@@ -395,6 +892,10 @@ class NodesStorageFieldPossessor(IName):
 		puts_opposite.add(self.name)
 		NodesManager.save_node(put)
 		NodesManager.save_node(self)
+		NodesManager.on_edge_added(*self._get_edge(to_put, further_type))
+
+	def _get_edge(self, member: str, further_type: str) -> tuple[str, str]:
+		return (member, self.name) if further_type == MemberTypes.PARENTS else (self.name, member)
 
 	def remove_parents(self, *parents):
 		self._remove_member(*parents, further_type=MemberTypes.PARENTS)
@@ -411,9 +912,12 @@ class NodesStorageFieldPossessor(IName):
 			opposite_node_further.remove(self.name)
 
 		further.remove(*to_removes)
+		for to_remove in to_removes:
+			NodesManager.on_edge_removed(*self._get_edge(to_remove, further_type))
 
 
 class Node(NodesStorageFieldPossessor, IName, dict):
+	__slots__ = ('name', 'parents', 'children')
 
 	def __init__(self, name: str, **kwargs):
 		super().__init__(name=name, **kwargs)
@@ -432,38 +936,43 @@ class Node(NodesStorageFieldPossessor, IName, dict):
 	def put(self, key: str, value: str) -> None:
 		self[key] = value
 
+	def mark_changed(self) -> None:
+		NodesManager.mark_node_changed(self)
+
+	def track(self, value):
+		return TrackedList(value, owner=self) if isinstance(value, list) else value
+
 	def __setattr__(self, name, value):
 		match name:
 			case MemberTypes.PARENTS | MemberTypes.CHILDREN:
 				if isinstance(value, str):
 					value = [value]
 				if isinstance(value, list | tuple):
-					collection: CollectiveField = self.__dict__[name]
+					collection: CollectiveField = getattr(self, name)
 					if value:
 						collection.add(*value)
 					else:
 						collection.clear()
 					return
 				if isinstance(value, NodesStorageField):
-					self.__dict__[name] = value
+					super().__setattr__(name, value)
 					return
 
 				raise ValueError
 			case MemberTypes.DESCRIPTIONS:
 				self[name] = value
 			case _:
-				self.__dict__[name] = value
+				super().__setattr__(name, value)
 
 	def to_dict(self) -> dict:
-		result = {self.name: {
+		return {self.name: self.to_data()}
+
+	def to_data(self) -> dict:
+		return {
 			**self.parents.to_dict(),
 			**self.children.to_dict(),
-			**self
-		}}
-		for key, val in self.items():
-			if not val:
-				result[self.name].pop(key)
-		return result
+			**{key: list(val) if isinstance(val, list) else val for key, val in self.items() if val}
+		}
 
 	def __hash__(self):
 		return hash(self.name)
@@ -473,22 +982,27 @@ class Node(NodesStorageFieldPossessor, IName, dict):
 			return super().__getitem__(key)
 		except KeyError:
 			if key in (MemberTypes.DESCRIPTIONS, ):
-				self[key] = []
+				super().__setitem__(key, self.track([]))
 				return super().__getitem__(key)
 			raise KeyError
 
 	def __setitem__(self, key, value):
 		if self._should_set_list(value):
-			super().__setitem__(key, [])
-			return
-		if self._should_be_treated_as_single_value(key, value):
-			super().__setitem__(key, value[0])
-			return
+			value = []
+		elif self._should_be_treated_as_single_value(key, value):
+			value = value[0]
+		elif isinstance(value, tuple):
+			value = list(value)
+
+		super().__setitem__(key, self.track(value))
+		self.mark_changed()
 
-		super().__setitem__(key, value)
+	def __delitem__(self, key):
+		super().__delitem__(key)
+		self.mark_changed()
 
 	def _should_be_treated_as_single_value(self, key, value):
-		return isinstance(value, Iterable) and not isinstance(value, str) and key not in self and len(value) == 1
+		return isinstance(value, Iterable) and not isinstance(value, str) and key not in self and key != MemberTypes.DESCRIPTIONS and len(value) == 1
 
 	def _should_set_list(self, value) -> bool:
 		if value == '[]':
@@ -503,3 +1017,107 @@ class Node(NodesStorageFieldPossessor, IName, dict):
 
 	def __repr__(self):
 		return f'{self.name}: parents({str(self.parents.names)}), children({str(self.children.names)})'
+
+
+class OrderedSet:
+	'''
+	Insertion-ordered set with constant-time membership, insertion and removal.
+	Positions are served from a list rebuilt on the first lookup after a change
+	'''
+	__slots__ = ('_items', '_positions')
+
+	def __init__(self, values: Iterable = ()):
+		self._items = dict.fromkeys(values)
+		self._positions: list | None = None
+
+	def add(self, value) -> None:
+		if value not in self._items:
+			self._items[value] = None
+			self._positions = None
+
+	def extend(self, values: Iterable) -> None:
+		for value in values:
+			self.add(value)
+
+	def remove(self, value) -> None:
+		try:
+			del self._items[value]
+		except KeyError:
+			raise ValueError(value) from None
+		self._positions = None
+
+	def clear(self) -> None:
+		self._items.clear()
+		self._positions = None
+
+	def replace(self, old, new) -> None:
+		'''
+		Puts the new value at the old one's position, which takes a pass over the values
+		'''
+		if old not in self._items:
+			raise ValueError(old)
+		self._items = {new if value == old else value: None for value in self._items}
+		self._positions = None
+
+	def _get_positions(self) -> list:
+		if self._positions is None:
+			self._positions = list(self._items)
+		return self._positions
+
+	def __getitem__(self, index: int | slice):
+		return self._get_positions()[index]
+
+	def __contains__(self, value) -> bool:
+		return value in self._items
+
+	def __len__(self) -> int:
+		return len(self._items)
+
+	def __iter__(self):
+		return iter(self._items)
+
+	def __reversed__(self):
+		return reversed(self._items)
+
+	def __eq__(self, other) -> bool:
+		if isinstance(other, OrderedSet):
+			return list(self._items) == list(other._items)
+		if isinstance(other, list | tuple):
+			return list(self._items) == list(other)
+		return NotImplemented
+
+	def __repr__(self):
+		return f'{type(self).__name__}({list(self._items)!r})'
+
+
+NO_MEMBERS = OrderedSet()  # shared by every field without members, which replace it on their first addition
+
+
+class TrackedList(list):
+	__slots__ = ('_owner',)
+
+	def __init__(self, values: Iterable, owner: Node):
+		super().__init__(values)
+		self._owner = owner
+
+	def _track(method: Callable) -> Callable:
+		def tracked(self, *args, **kwargs):
+			result = method(self, *args, **kwargs)
+			self._owner.mark_changed()
+			return result
+		return tracked
+
+	append = _track(list.append)
+	extend = _track(list.extend)
+	insert = _track(list.insert)
+	remove = _track(list.remove)
+	pop = _track(list.pop)
+	clear = _track(list.clear)
+	sort = _track(list.sort)
+	reverse = _track(list.reverse)
+	__setitem__ = _track(list.__setitem__)
+	__delitem__ = _track(list.__delitem__)
+	__iadd__ = _track(list.__iadd__)
+	__imul__ = _track(list.__imul__)
+
+	del _track
@@ -1,9 +1,15 @@
-from typing import Iterable
+import sys
+from functools import partial
+from itertools import islice
+from typing import Iterable, Iterator
 
-from nodes import Node
+from nodes import ImportSummary, Node
 
 
 class Formatter:
+	separator = ', '
+	truncation = '...'
+	indent = '    '
 
 	@classmethod
 	def format_short_node_info(cls, node: Node):
@@ -11,43 +17,80 @@ class Formatter:
 		return line
 
 	@classmethod
-	def format_detailed_node_info(cls, node: Node):
-		info = ''
-		info += f'Name: {node.name}\n'
-		info += f'Parents:  {", ".join(node.parents.names)}\n'
-		info += f'Children: {", ".join(node.children.names)}\n'
-		info += f'Ancestors:   {", ".join(node.get_all_ancestors_names())}\n'
-		info += f'Descendants: {", ".join(node.get_all_descendants_names())}\n'
-		level = 0
-		base_space = '    '
+	def format_detailed_node_info(cls, node: Node, depth: int = None, max_items: int = None) -> Iterator[str]:
+		'''
+		Line by line. The depth and the item limit stop the walks through the members, not just what gets printed
+		'''
+		ancestors = node.get_all_ancestors_names() if depth is None else node.parents.get_all_member_names_within(depth)
+		descendants = node.get_all_descendants_names() if depth is None else node.children.get_all_member_names_within(depth)
+		yield f'Name: {node.name}'
+		yield f'Parents:  {cls._format_names(node.parents.get_names(), max_items)}'
+		yield f'Children: {cls._format_names(node.children.get_names(), max_items)}'
+		yield f'Ancestors:   {cls._format_names(ancestors, max_items)}'
+		yield f'Descendants: {cls._format_names(descendants, max_items)}'
 		for key, val in node.items():
-			info += f'{base_space * level}{key}: '
 			if isinstance(val, Iterable) and not isinstance(val, str):
-				info += '\n'
-				for i, iter_val in enumerate(val):
-					info += f'{base_space * (level +1)}{i}) {iter_val}\n'
+				yield f'{key}:'
+				values = list(islice(val, cls._get_peek_limit(max_items)))
+				for i, iter_val in enumerate(islice(values, max_items), 1):
+					yield f'{cls.indent}{i}) {iter_val}'
+				if max_items is not None and len(values) > max_items:
+					yield f'{cls.indent}{cls.truncation}'
 			else:
-				info += val + '\n'
+				yield f'{key}: {val}'
 
-		return info
+	@classmethod
+	def _format_names(cls, names: Iterable[str], max_items: int = None) -> str:
+		names = list(islice(names, cls._get_peek_limit(max_items)))
+		if max_items is not None and len(names) > max_items:
+			names[max_items:] = [cls.truncation]
+		return cls.separator.join(names)
+
+	@classmethod
+	def _get_peek_limit(cls, max_items: int = None) -> int | None:
+		'''
+		One item past the limit tells whether anything was cut off
+		'''
+		return None if max_items is None else max_items + 1
 
 
 class Printer:
 
 	out = print
+	err = partial(print, file=sys.stderr)
 
 	@classmethod
 	def print(cls, to_print, **kwargs):
 		cls.out(to_print, **kwargs)
 
 	@classmethod
-	def print_short_node_info(cls, nodes: Iterable[Node]):
+	def print_error(cls, message: str):
+		cls.err(message)
+
+	@classmethod
+	def print_lines(cls, lines: Iterable[str]):
+		for line in lines:
+			cls.out(line)
+
+	@classmethod
+	def print_short_node_info(cls, nodes: Iterable[Node], offset: int = 0):
 		infos = map(Formatter.format_short_node_info, nodes)
-		numerated = (f'{i+1}) {info}' for i, info in enumerate(infos))
+		numerated = (f'{i+1}) {info}' for i, info in enumerate(infos, offset))
 		for line in numerated:
 			cls.out(line)
 
 	@classmethod
-	def print_detailed_node_info(cls, node: Node):
-		info = Formatter.format_detailed_node_info(node)
-		cls.out(info + '\n')
+	def print_import_summary(cls, summary: ImportSummary):
+		if not summary.is_imported:
+			cls.print_error(f'Nothing imported, these nodes would form a cycle: {", ".join(summary.cycle)}')
+		else:
+			cls.out(f'Imported {summary.added} nodes and {summary.edges} edges')
+		if summary.duplicates:
+			cls.print_error(f'Skipped existing nodes: {", ".join(summary.duplicates)}')
+		if summary.missing:
+			cls.print_error(f'Skipped edges to unknown nodes: {", ".join(summary.missing)}')
+
+	@classmethod
+	def print_detailed_node_info(cls, node: Node, depth: int = None, max_items: int = None):
+		cls.print_lines(Formatter.format_detailed_node_info(node, depth, max_items))
+		cls.out('')
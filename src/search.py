@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from itertools import repeat
+from typing import Any, Callable, Iterable, Iterator, Pattern
+
+
+@dataclass(frozen=True)
+class Predicate:
+	key: str
+	pattern: Pattern | None  # None requires the key not to be set
+	falls_back_to_name: bool = False
+
+	def look_up(self, searcher: Any) -> set[str]:
+		if self.pattern is None:
+			return searcher.find_names_without(self.key)
+		found = searcher.find_names_by_value(self.key, self.pattern)
+		if self.falls_back_to_name:
+			found |= searcher.find_names_by_name(self.pattern) - searcher.find_names_with(self.key)
+		return found
+
+	def estimate(self, searcher: Any) -> int:
+		if self.pattern is None:
+			return searcher.count_names() - searcher.estimate_names_with(self.key)
+		estimate = searcher.estimate_names_by_value(self.key, self.pattern)
+		if self.falls_back_to_name:
+			estimate += searcher.estimate_names_by_name(self.pattern)
+		return estimate
+
+	def matches(self, name: str, attributes: dict) -> bool:
+		if self.pattern is None:
+			return self.key not in attributes
+		if self.key not in attributes:
+			return self.falls_back_to_name and self.pattern.search(name) is not None
+		value = attributes[self.key]
+		values = value if isinstance(value, list) else [value]
+		return any(isinstance(value, str) and self.pattern.search(value) for value in values)
+
+	def get_check_cost(self) -> int:
+		return 0 if self.pattern is None else 1 + self.falls_back_to_name
+
+	def __str__(self):
+		if self.pattern is None:
+			return f'{self.key} is not set'
+		described = f'{self.key} matches {self.pattern.pattern!r}'
+		if self.falls_back_to_name:
+			described += ' (or the name, if unset)'
+		return described
+
+
+@dataclass
+class QueryPlan:
+	lookups: list[Predicate]
+	checks: list[Predicate]
+	is_union: bool
+	estimates: dict[Predicate, int] = field(default_factory=dict)
+
+	def execute(self, names: Iterable[str], searcher: Any, verify: Callable[[str, Predicate], bool]) -> Iterable[str]:
+		if self.lookups:
+			found = self._look_up(searcher)
+			names = filter(found.__contains__, names)
+		if self.checks:
+			combine = any if self.is_union else all
+			names = filter(lambda name: combine(verify(name, predicate) for predicate in self.checks), names)
+		return names
+
+	def _look_up(self, searcher: Any) -> set[str]:
+		found = self.lookups[0].look_up(searcher)
+		for predicate in self.lookups[1:]:
+			if self.is_union:
+				found |= predicate.look_up(searcher)
+			elif found:
+				found &= predicate.look_up(searcher)
+		return found
+
+	def explain(self) -> list[str]:
+		steps = []
+		for i, predicate in enumerate(self.lookups):
+			action = 'look up' if not i else 'unite with' if self.is_union else 'intersect with'
+			steps.append(f'{action} {predicate} (~{self.estimates[predicate]} names)')
+		if not self.lookups:
+			steps.append('scan every node')
+		if self.checks:
+			joined = ' or '.join(map(str, self.checks)) if self.is_union else ' and '.join(map(str, self.checks))
+			steps.append(f'check {"each candidate" if self.lookups else "each node"}: {joined}')
+		return [f'{i+1}) {step}' for i, step in enumerate(steps)]
+
+
+class QueryPlanner:
+	'''
+	Looks the most selective criteria up first and checks the rest on the candidates once that is cheaper
+	'''
+	check_cost = 4
+
+	def __init__(self, searcher: Any = None):
+		self._searcher = searcher
+
+	def plan(self, predicates: Iterable[Predicate], func: Callable = None) -> QueryPlan:
+		predicates = list(dict.fromkeys(predicates))
+		is_union = func is any
+		if self._searcher is None:
+			return QueryPlan([], sorted(predicates, key=Predicate.get_check_cost), is_union)
+		estimates = {predicate: predicate.estimate(self._searcher) for predicate in predicates}
+		if is_union:
+			return QueryPlan(predicates, [], is_union, estimates)
+		ordered = sorted(predicates, key=estimates.get)
+		lookups, checks = ordered[:1], []
+		candidates = estimates[ordered[0]]
+		for predicate in ordered[1:]:
+			if candidates * self.check_cost < estimates[predicate]:
+				checks.append(predicate)
+			else:
+				lookups.append(predicate)
+				candidates = min(candidates, estimates[predicate])
+		return QueryPlan(lookups, sorted(checks, key=Predicate.get_check_cost), is_union, estimates)
+
+
+_snapshot: list[tuple[str, dict]] = []
+
+
+def search_in_parallel(items: Iterable[tuple[str, dict]], predicates: list[Predicate], is_union: bool, ignored_keys: Iterable[str] = (), workers: int = None) -> Iterator[str]:
+	'''
+	Checks the predicates in worker processes, yielding the matching names in the order of the items.
+	Forked workers read their chunks from a shared snapshot, others get them pickled
+	'''
+	global _snapshot
+	import multiprocessing  # pulls in most of concurrency, so only when searching in parallel
+	from concurrent.futures import ProcessPoolExecutor
+
+	items = list(items)
+	workers = workers or os.cpu_count() or 1
+	chunk_size = max(1, -(-len(items) // (workers * 4)))
+	can_fork = 'fork' in multiprocessing.get_all_start_methods()
+	if can_fork:
+		_snapshot = items
+		chunks = [range(start, min(start + chunk_size, len(items))) for start in range(0, len(items), chunk_size)]
+	else:
+		chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+	executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork') if can_fork else None)
+	try:
+		for found in executor.map(_match_chunk, chunks, repeat(predicates), repeat(is_union), repeat(frozenset(ignored_keys))):
+			yield from found
+	finally:
+		executor.shutdown(cancel_futures=True)
+		_snapshot = []
+
+
+def _match_chunk(chunk: range | list[tuple[str, dict]], predicates: list[Predicate], is_union: bool, ignored_keys: frozenset[str]) -> list[str]:
+	if isinstance(chunk, range):
+		chunk = map(_snapshot.__getitem__, chunk)
+	combine = any if is_union else all
+	is_any_key_ignored = any(predicate.key in ignored_keys for predicate in predicates)
+	found = []
+	for name, data in chunk:
+		if is_any_key_ignored:
+			data = {key: value for key, value in data.items() if key not in ignored_keys}
+		if combine(predicate.matches(name, data) for predicate in predicates):
+			found.append(name)
+	return found
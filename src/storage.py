@@ -0,0 +1,525 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from collections.abc import ItemsView, MutableMapping
+from pathlib import Path
+from typing import Iterable, Iterator, Pattern
+
+from indexes import get_anchored_literal
+
+
+class SnapshotCache:
+	'''
+	The parsed snapshot as JSON, which loads far faster than yaml: a line with the signature of the snapshot it was made from, then the data
+	'''
+	MAGIC = b'CATC\x02\n'
+
+	def __init__(self, snapshot_path: Path):
+		self.path = snapshot_path.with_name(f'{snapshot_path.name}.cache')
+
+	@classmethod
+	def _get_signature(cls, raw: bytes, stat: os.stat_result) -> list:
+		return [stat.st_mtime_ns, stat.st_size, hashlib.blake2b(raw, digest_size=16).hexdigest()]
+
+	@classmethod
+	def _is_kept_by_json(cls, value) -> bool:
+		'''
+		JSON turns every key into a string and cannot hold e.g. dates, both of which yaml produces
+		'''
+		if isinstance(value, dict):
+			return all(isinstance(key, str) and cls._is_kept_by_json(item) for key, item in value.items())
+		if isinstance(value, list):
+			return all(map(cls._is_kept_by_json, value))
+		return value is None or isinstance(value, (str, int, float))
+
+	def load(self, raw: bytes, stat: os.stat_result) -> dict | None:
+		try:
+			with open(self.path, 'rb') as cache_file:
+				if cache_file.read(len(self.MAGIC)) != self.MAGIC:
+					return None
+				if json.loads(cache_file.readline()) != self._get_signature(raw, stat):
+					return None
+				return json.loads(cache_file.read())
+		except (OSError, ValueError):
+			return None
+
+	def store(self, data: dict, raw: bytes, stat: os.stat_result) -> None:
+		if not self._is_kept_by_json(data):
+			self.clear()
+			return
+		temp_path = self.path.with_name(f'{self.path.name}.tmp')
+		with open(temp_path, 'wb') as cache_file:
+			cache_file.write(self.MAGIC)
+			cache_file.write(json.dumps(self._get_signature(raw, stat)).encode() + b'\n')
+			cache_file.write(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode())
+		os.replace(temp_path, self.path)
+
+	def clear(self) -> None:
+		self.path.unlink(missing_ok=True)
+
+
+class Snapshot:
+	def __init__(self, path: Path):
+		self.path = path
+		self._cache = SnapshotCache(path)
+
+	def load(self) -> dict:
+		raw = self.path.read_bytes()
+		if not raw:
+			return {}
+		stat = self.path.stat()
+		data = self._cache.load(raw, stat)
+		if data is None:
+			import yaml  # only needed on a cache miss, so warm starts skip importing it
+			data = yaml.load(raw, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader)) or {}
+			self._cache.store(data, raw, stat)
+		return data
+
+	def dump(self, data: dict) -> None:
+		import yaml
+		path = self.path.resolve()
+		raw = yaml.dump(data, Dumper=getattr(yaml, 'CSafeDumper', yaml.SafeDumper),
+						default_flow_style=False,
+						sort_keys=False,
+						allow_unicode=True).encode('utf-8')
+		temp_path = path.with_name(f'{path.name}.tmp')
+		with open(temp_path, 'wb') as data_file:
+			data_file.write(raw)
+		os.replace(temp_path, path)
+		self._cache.store(data, raw, path.stat())
+
+
+class ListingFile:
+	'''
+	The numbers the last listing printed, kept next to the data so that every later process resolves them alike.
+	Remembers what it holds, so that listing the same again writes nothing
+	'''
+
+	def __init__(self, snapshot_path: Path):
+		self.path = snapshot_path.with_name(f'{snapshot_path.name}.listing')
+		self._kept: tuple[int, list[str | None] | None] = None
+
+	def load(self) -> tuple[int, list[str | None] | None] | None:
+		try:
+			with open(self.path, encoding='utf-8') as listing:
+				kept = json.load(listing)
+			self._kept = kept['offset'], kept['names']
+		except (FileNotFoundError, ValueError, TypeError, KeyError):
+			self._kept = None
+			return None
+		return self._kept[0], None if self._kept[1] is None else list(self._kept[1])
+
+	def store(self, offset: int, names: list[str | None] | None) -> None:
+		if self._kept == (offset, names):
+			return
+		temp_path = self.path.with_name(f'{self.path.name}.tmp')
+		with open(temp_path, 'w', encoding='utf-8') as listing:
+			json.dump({'offset': offset, 'names': names}, listing, ensure_ascii=False)
+		os.replace(temp_path, self.path)
+		self._kept = offset, None if names is None else list(names)
+
+
+class Journal:
+	PUT = 'put'
+	DELETE = 'del'
+
+	def __init__(self, snapshot_path: Path):
+		self.path = snapshot_path.with_name(f'{snapshot_path.name}.journal')
+		self._length = 0
+
+	@classmethod
+	def make_put(cls, name: str, data: dict) -> dict:
+		return {'op': cls.PUT, 'name': name, 'data': data}
+
+	@classmethod
+	def make_delete(cls, name: str) -> dict:
+		return {'op': cls.DELETE, 'name': name}
+
+	def replay(self, data: dict) -> dict:
+		self._length = 0
+		if not self.path.exists():
+			return data
+		good_end = 0
+		with open(self.path, 'rb') as journal_file:
+			for line in journal_file:
+				try:
+					record = json.loads(line)
+				except ValueError:
+					break
+				self._apply(record, data)
+				self._length += 1
+				good_end += len(line)
+		if good_end < self.path.stat().st_size:  # a torn tail left by an interrupted append
+			os.truncate(self.path, good_end)
+		return data
+
+	def _apply(self, record: dict, data: dict) -> None:
+		name = record['name']
+		match record['op']:
+			case self.PUT:
+				data[name] = record['data']
+			case self.DELETE:
+				data.pop(name, None)
+
+	def append(self, records: Iterable[dict]) -> None:
+		'''
+		Raises TypeError, writing nothing, when a record holds a value JSON cannot encode, e.g. a date
+		'''
+		lines = [json.dumps(record, ensure_ascii=False) + '\n' for record in records]
+		if not lines:
+			return
+		with open(self.path, 'a', encoding='utf-8') as journal_file:
+			journal_file.writelines(lines)
+			journal_file.flush()
+			os.fsync(journal_file.fileno())
+		self._length += len(lines)
+
+	def clear(self) -> None:
+		self.path.unlink(missing_ok=True)
+		self._length = 0
+
+	def __len__(self):
+		return self._length
+
+
+class StorageBackend(ABC):
+	supports_search = False
+
+	def __init__(self, path: Path):
+		self.path = path
+
+	@abstractmethod
+	def load(self) -> MutableMapping[str, dict]:
+		raise NotImplementedError
+
+	@abstractmethod
+	def save(self, data: MutableMapping[str, dict]) -> None:
+		raise NotImplementedError
+
+	def compact(self, data: MutableMapping[str, dict]) -> None:
+		self.save(data)
+
+	def mark_changed(self, name: str) -> None:
+		pass
+
+	def mark_deleted(self, name: str) -> None:
+		pass
+
+	def close(self) -> None:
+		pass
+
+
+class YamlBackend(StorageBackend):
+	use_journal = True
+	journal_compaction_threshold = 1000
+
+	def __init__(self, path: Path):
+		super().__init__(path)
+		self._snapshot = Snapshot(path)
+		self._journal = Journal(path)
+		self._changed_names = {}
+		self._deleted_names = set()
+
+	def load(self) -> dict:
+		self._forget_changes()
+		return self._journal.replay(self._snapshot.load())
+
+	def save(self, data: dict) -> None:
+		if self.use_journal and len(self._journal) + len(self._changed_names) < self.journal_compaction_threshold:
+			try:
+				self._journal.append(self._get_change_records(data))
+			except TypeError:  # only the yaml snapshot keeps every type yaml reads
+				return self.compact(data)
+			self._forget_changes()
+		else:
+			self.compact(data)
+
+	def compact(self, data: dict) -> None:
+		self._snapshot.dump(data)
+		self._journal.clear()
+		self._forget_changes()
+
+	def _get_change_records(self, data: dict) -> Iterable[dict]:
+		for name in self._changed_names:
+			if name in self._deleted_names:
+				yield Journal.make_delete(name)
+			if name in data:
+				yield Journal.make_put(name, data[name])
+
+	def mark_changed(self, name: str) -> None:
+		self._changed_names[name] = None
+
+	def mark_deleted(self, name: str) -> None:
+		self._changed_names.pop(name, None)
+		self._changed_names[name] = None
+		self._deleted_names.add(name)
+
+	def _forget_changes(self) -> None:
+		self._changed_names.clear()
+		self._deleted_names.clear()
+
+
+class SqliteData(MutableMapping):
+	EDGE_TYPES = ('parents', 'children')
+	SCHEMA = '''
+		CREATE TABLE IF NOT EXISTS nodes (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+		CREATE TABLE IF NOT EXISTS edges (node INTEGER NOT NULL, type TEXT NOT NULL, member TEXT NOT NULL);
+		CREATE INDEX IF NOT EXISTS edges_by_node ON edges (node);
+		CREATE INDEX IF NOT EXISTS edges_by_member ON edges (member, type);
+		CREATE TABLE IF NOT EXISTS attributes (node INTEGER NOT NULL, key TEXT NOT NULL, value, is_list INTEGER NOT NULL);
+		CREATE INDEX IF NOT EXISTS attributes_by_node ON attributes (node, key);
+		CREATE INDEX IF NOT EXISTS attributes_by_key ON attributes (key, value);
+	'''
+
+	def __init__(self, connection: sqlite3.Connection):
+		self._connection = connection
+		self._connection.executescript(self.SCHEMA)
+		self._written = {}
+		self._new = {}
+		self._deleted = set()
+
+	# Reading
+
+	def _get_id(self, name: str) -> int | None:
+		row = self._connection.execute('SELECT id FROM nodes WHERE name = ?', (name,)).fetchone()
+		return row[0] if row else None
+
+	def _is_committed(self, name: str) -> bool:
+		return self._get_id(name) is not None
+
+	def _read(self, node_id: int) -> dict:
+		data = {}
+		edges = self._connection.execute('SELECT type, member FROM edges WHERE node = ? ORDER BY rowid', (node_id,))
+		for type, member in edges:
+			data.setdefault(type, []).append(member)
+		attributes = self._connection.execute('SELECT key, value, is_list FROM attributes WHERE node = ? ORDER BY rowid', (node_id,))
+		for key, value, is_list in attributes:
+			self._put_attribute(data, key, value, is_list)
+		return data
+
+	@classmethod
+	def _put_attribute(cls, data: dict, key: str, value, is_list: int) -> None:
+		if is_list:
+			data.setdefault(key, []).append(value)
+		else:
+			data[key] = value
+
+	def __getitem__(self, name: str) -> dict:
+		if name in self._written:
+			return self._written[name]
+		node_id = None if name in self._deleted else self._get_id(name)
+		if node_id is None:
+			raise KeyError(name)
+		return self._read(node_id)
+
+	def __contains__(self, name) -> bool:
+		return name in self._written or (name not in self._deleted and self._is_committed(name))
+
+	def __iter__(self) -> Iterator[str]:
+		for name, in self._connection.execute('SELECT name FROM nodes ORDER BY id'):
+			if name not in self._deleted:
+				yield name
+		yield from list(self._new)
+
+	def __len__(self) -> int:
+		committed, = self._connection.execute('SELECT count(*) FROM nodes').fetchone()
+		return committed - len(self._deleted) + len(self._new)
+
+	def items(self) -> ItemsView:
+		return SqliteItemsView(self)
+
+	def iter_items(self) -> Iterator[tuple[str, dict]]:
+		execute = self._connection.execute
+		edges = execute('SELECT node, type, member FROM edges ORDER BY node, rowid')
+		attributes = execute('SELECT node, key, value, is_list FROM attributes ORDER BY node, rowid')
+		edge = next(edges, None)
+		attribute = next(attributes, None)
+		for node_id, name in execute('SELECT id, name FROM nodes ORDER BY id'):
+			data = {}
+			while edge and edge[0] <= node_id:
+				if edge[0] == node_id:
+					data.setdefault(edge[1], []).append(edge[2])
+				edge = next(edges, None)
+			while attribute and attribute[0] <= node_id:
+				if attribute[0] == node_id:
+					self._put_attribute(data, *attribute[1:])
+				attribute = next(attributes, None)
+			if name not in self._deleted:
+				yield name, self._written.get(name, data)
+		for name in list(self._new):
+			yield name, self._written[name]
+
+	# Writing
+
+	def __setitem__(self, name: str, data: dict) -> None:
+		if name not in self._written and (name in self._deleted or not self._is_committed(name)):
+			self._new[name] = None
+		self._written[name] = data
+
+	def __delitem__(self, name: str) -> None:
+		if name not in self:
+			raise KeyError(name)
+		self._written.pop(name, None)
+		self._new.pop(name, None)
+		if self._is_committed(name):
+			self._deleted.add(name)
+
+	def flush(self) -> None:
+		if not self._written and not self._deleted:
+			return
+		with self._connection:
+			for name in self._deleted:
+				self._delete_rows(self._get_id(name), with_node=True)
+			for name, data in self._written.items():
+				node_id = self._get_id(name)
+				if node_id is None:
+					node_id = self._connection.execute('INSERT INTO nodes (name) VALUES (?)', (name,)).lastrowid
+				else:
+					self._delete_rows(node_id)
+				self._insert_rows(node_id, data)
+		self._written.clear()
+		self._new.clear()
+		self._deleted.clear()
+
+	def _delete_rows(self, node_id: int, with_node: bool = False) -> None:
+		execute = self._connection.execute
+		execute('DELETE FROM edges WHERE node = ?', (node_id,))
+		execute('DELETE FROM attributes WHERE node = ?', (node_id,))
+		if with_node:
+			execute('DELETE FROM nodes WHERE id = ?', (node_id,))
+
+	def _insert_rows(self, node_id: int, data: dict) -> None:
+		edges = [(node_id, type, member) for type in self.EDGE_TYPES for member in data.get(type, ())]
+		attributes = []
+		for key, value in data.items():
+			if key in self.EDGE_TYPES:
+				continue
+			if isinstance(value, list | tuple):
+				attributes.extend((node_id, key, element, 1) for element in value)
+			else:
+				attributes.append((node_id, key, value, 0))
+		self._connection.executemany('INSERT INTO edges VALUES (?, ?, ?)', edges)
+		self._connection.executemany('INSERT INTO attributes VALUES (?, ?, ?, ?)', attributes)
+
+	# Searching
+
+	def _select_committed_names(self, query: str, *params) -> set[str]:
+		pending = self._written.keys() | self._deleted
+		return {name for name, in self._connection.execute(query, params) if name not in pending}
+
+	def _register_matcher(self, pattern: Pattern) -> None:
+		self._connection.create_function('matches', 1, lambda value: isinstance(value, str) and pattern.search(value) is not None, deterministic=True)
+
+	def find_names_by_name(self, pattern: Pattern) -> set[str]:
+		self._register_matcher(pattern)
+		found = self._select_committed_names('SELECT name FROM nodes WHERE matches(name)')
+		found.update(name for name in self._written if pattern.search(name))
+		return found
+
+	def find_names_by_value(self, key: str, pattern: Pattern) -> set[str]:
+		literal, is_exact = get_anchored_literal(pattern)
+		if is_exact:
+			found = self._select_committed_names('''
+				SELECT DISTINCT name FROM attributes JOIN nodes ON nodes.id = attributes.node
+				WHERE key = ? AND value = ?''', key, literal)
+		else:
+			self._register_matcher(pattern)
+			found = self._select_committed_names('''
+				SELECT DISTINCT name FROM attributes JOIN nodes ON nodes.id = attributes.node
+				WHERE key = ? AND matches(value)''', key)
+		found.update(name for name, data in self._written.items() if self._has_matching_value(data.get(key), pattern))
+		return found
+
+	@classmethod
+	def _has_matching_value(cls, value, pattern: Pattern) -> bool:
+		values = value if isinstance(value, list) else [value]
+		return any(isinstance(value, str) and pattern.search(value) for value in values)
+
+	def find_names_with(self, key: str) -> set[str]:
+		found = self._select_committed_names('''
+			SELECT DISTINCT name FROM attributes JOIN nodes ON nodes.id = attributes.node WHERE key = ?''', key)
+		found.update(name for name, data in self._written.items() if key in data)
+		return found
+
+	def find_names_without(self, key: str) -> set[str]:
+		found = self._select_committed_names('''
+			SELECT name FROM nodes WHERE NOT EXISTS (SELECT 1 FROM attributes WHERE node = nodes.id AND key = ?)''', key)
+		found.update(name for name, data in self._written.items() if key not in data)
+		return found
+
+
+	# Estimating
+
+	def count_names(self) -> int:
+		return len(self)
+
+	def estimate_names_by_name(self, pattern: Pattern) -> int:
+		literal, is_exact = get_anchored_literal(pattern)
+		return 1 if is_exact else len(self)
+
+	def estimate_names_by_value(self, key: str, pattern: Pattern) -> int:
+		literal, is_exact = get_anchored_literal(pattern)
+		if not is_exact:
+			return self.estimate_names_with(key)
+		count, = self._connection.execute('SELECT count(DISTINCT node) FROM attributes WHERE key = ? AND value = ?', (key, literal)).fetchone()
+		return count + len(self._written)
+
+	def estimate_names_with(self, key: str) -> int:
+		count, = self._connection.execute('SELECT count(DISTINCT node) FROM attributes WHERE key = ?', (key,)).fetchone()
+		return count + len(self._written)
+
+
+class SqliteItemsView(ItemsView):
+	def __iter__(self):
+		return self._mapping.iter_items()
+
+
+class SqliteBackend(StorageBackend):
+	supports_search = True
+
+	def __init__(self, path: Path):
+		super().__init__(path)
+		self._connection = sqlite3.connect(path)
+		self.data: SqliteData = None
+
+	def load(self) -> SqliteData:
+		self.data = SqliteData(self._connection)
+		return self.data
+
+	def save(self, data: SqliteData) -> None:
+		data.flush()
+
+	def compact(self, data: SqliteData) -> None:
+		data.flush()
+		self._connection.execute('VACUUM')
+
+	def close(self) -> None:
+		self._connection.close()
+
+	def find_names_by_name(self, pattern: Pattern) -> set[str]:
+		return self.data.find_names_by_name(pattern)
+
+	def find_names_by_value(self, key: str, pattern: Pattern) -> set[str]:
+		return self.data.find_names_by_value(key, pattern)
+
+	def find_names_with(self, key: str) -> set[str]:
+		return self.data.find_names_with(key)
+
+	def find_names_without(self, key: str) -> set[str]:
+		return self.data.find_names_without(key)
+
+	def count_names(self) -> int:
+		return self.data.count_names()
+
+	def estimate_names_by_name(self, pattern: Pattern) -> int:
+		return self.data.estimate_names_by_name(pattern)
+
+	def estimate_names_by_value(self, key: str, pattern: Pattern) -> int:
+		return self.data.estimate_names_by_value(key, pattern)
+
+	def estimate_names_with(self, key: str) -> int:
+		return self.data.estimate_names_with(key)
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from itertools import chain
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from nodes import ImportSummary, MemberTypes, NodesManager
+
+Record = tuple[str, dict]
+NAME = 'name'
+LIST_SEPARATOR = ';'
+
+
+def normalize(data: dict | None) -> dict:
+	'''
+	Turns a single parent, child or description into a list and drops the empty values
+	'''
+	data = dict(data or {})
+	for key in MemberTypes.ALL:
+		if isinstance(data.get(key), str) and data[key]:
+			data[key] = [data[key]]
+	return {key: value for key, value in data.items() if value not in (None, '', [])}
+
+
+def read_jsonl(path: Path) -> Iterator[Record]:
+	with open(path, encoding='utf-8') as records:
+		for line_number, line in enumerate(records, 1):
+			if not line.strip():
+				continue
+			data = json.loads(line)
+			yield _pop_name(data, path, line_number), normalize(data)
+
+
+def read_csv(path: Path) -> Iterator[Record]:
+	'''
+	One node per row, with a "name" column; parents, children and descriptions hold ";"-separated lists
+	'''
+	with open(path, encoding='utf-8', newline='') as records:
+		for line_number, row in enumerate(csv.DictReader(records), 2):
+			data = {key: value for key, value in row.items() if key is not None}
+			for key in MemberTypes.ALL:
+				if data.get(key):
+					data[key] = [value.strip() for value in data[key].split(LIST_SEPARATOR) if value.strip()]
+			yield _pop_name(data, path, line_number), normalize(data)
+
+
+def read_yaml(path: Path) -> Iterator[Record]:
+	'''
+	The database's own layout: node names mapped to their data
+	'''
+	import yaml
+	with open(path, 'rb') as records:
+		data = yaml.load(records, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader)) or {}
+	for name, node_data in data.items():
+		yield str(name), normalize(node_data)
+
+
+def _pop_name(data: dict, path: Path, line_number: int) -> str:
+	name = data.pop(NAME, None)
+	if not name:
+		raise ValueError(f'{path}:{line_number}: a record without a {NAME}')
+	return str(name)
+
+
+readers: dict[str, Callable[[Path], Iterable[Record]]] = {
+	'.csv': read_csv,
+	'.jsonl': read_jsonl,
+	'.ndjson': read_jsonl,
+	'.yml': read_yaml,
+	'.yaml': read_yaml,
+}
+
+
+def read_records(path: str | Path) -> Iterable[Record]:
+	path = Path(path)
+	try:
+		reader = readers[path.suffix.lower()]
+	except KeyError:
+		raise ValueError(f'Cannot import {path.name}, expected one of: {", ".join(readers)}') from None
+	return reader(path)
+
+
+def import_file(path: str | Path) -> ImportSummary:
+	return NodesManager.import_nodes(read_records(path))
+
+
+def get_export_records(categories: Iterable[str] = ()) -> Iterator[Record]:
+	'''
+	Every node, or just the given categories with their descendants, without members outside of them
+	'''
+	data = NodesManager.get_data()
+	categories = list(categories)
+	if not categories:
+		yield from data.items()
+		return
+	descendants = (NodesManager.get_node(category).get_all_descendants_names() for category in categories)
+	names = dict.fromkeys(chain(categories, *descendants))
+	for name in names:
+		node_data = {}
+		for key, value in data[name].items():
+			if key in (MemberTypes.PARENTS, MemberTypes.CHILDREN):
+				value = [member for member in value if member in names]
+			if value:
+				node_data[key] = value
+		yield name, node_data
+
+
+class ExportRecords:
+	'''
+	Walks the records afresh on every iteration, so that a format can take two passes over them without holding them all
+	'''
+
+	def __init__(self, categories: Iterable[str] = ()):
+		self.categories = list(categories)
+
+	def __iter__(self) -> Iterator[Record]:
+		return get_export_records(self.categories)
+
+
+def format_jsonl(records: Iterable[Record]) -> Iterator[str]:
+	for name, data in records:
+		yield json.dumps({NAME: name, **data}, ensure_ascii=False)
+
+
+def format_csv(records: Iterable[Record]) -> Iterator[str]:
+	'''
+	A row per node as read_csv takes it: a name, the members joined with ";" and a column per other key.
+	The header needs every key, so a first pass collects them and a second writes the rows. Only a one-shot iterator is gathered in memory
+	'''
+	if isinstance(records, Iterator):
+		records = list(records)
+	keys = list(dict.fromkeys(chain(MemberTypes.ALL, (key for _, data in records for key in data))))
+	row = io.StringIO()
+	writer = csv.writer(row, lineterminator='')
+	for values in chain([(NAME, *keys)], ((name, *(_format_csv_value(data.get(key)) for key in keys)) for name, data in records)):
+		writer.writerow(values)
+		yield row.getvalue()
+		row.seek(0)
+		row.truncate()
+
+
+def _format_csv_value(value) -> str:
+	if value is None:
+		return ''
+	if isinstance(value, list):
+		return LIST_SEPARATOR.join(map(str, value))
+	return str(value)
+
+
+def format_yaml(records: Iterable[Record]) -> Iterator[str]:
+	'''
+	The database's own layout, one node at a time, so it reads back with read_yaml
+	'''
+	import yaml
+	dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+	for name, data in records:
+		yield yaml.dump({name: data or None}, Dumper=dumper, default_flow_style=False, sort_keys=False, allow_unicode=True).rstrip('\n')
+
+
+formatters: dict[str, Callable[[Iterable[Record]], Iterator[str]]] = {
+	'jsonl': format_jsonl,
+	'csv': format_csv,
+	'yaml': format_yaml,
+}
+
+
+def export_lines(format: str, categories: Iterable[str] = ()) -> Iterator[str]:
+	try:
+		formatter = formatters[format]
+	except KeyError:
+		raise ValueError(f'Cannot export as {format}, expected one of: {", ".join(formatters)}') from None
+	return formatter(ExportRecords(categories))
@@ -15,6 +15,11 @@ class AbstractCategorierTest(AbstractTest, ABC):
 		super().setUp()
 		NodesManager.load_data(self.test_path)
 
+	def tearDown(self) -> None:
+		super().tearDown()
+		for side_file in self.test_path.parent.glob(f'{self.test_path.name}.*'):
+			side_file.unlink()
+
 	def flatten_string_lists(self, *to_flattens, unique=False):
 		flat = []
 		for member in to_flattens:
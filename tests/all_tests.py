@@ -1,14 +1,29 @@
 import unittest
 
 from abstractTest import AbstractTest
+from batchTest import BatchTest
 from changeTest import ChangeTest
+from compactNodeTest import CompactNodeTest
+from daemonTest import DaemonTest
 from descriptionTest import DescriptionTest
+from detailedInfoTest import DetailedInfoTest
+from exportTest import ExportTest
 from flatConnectingTest import FlatConnectingTest
+from importTest import ImportTest
+from lazyCliTest import LazyCliTest
 from multipleNodesTest import MultipleNodesTest
 from nodeConnectingTest import NodeConnectingTest
 from nodeValuesTest import NodeValuesTest
+from orderedSetTest import OrderedSetTest
+from persistenceTest import PersistenceTest
+from queryPlannerTest import QueryPlannerTest, ParallelSearchTest
 from deleteAncestorTest import DeleteAncestorTest
 from searchTest import SearchTest
+from sqliteStorageTest import SqliteStorageTest, SqliteSearchTest
+from attributeIndexTest import AttributeIndexedSearchTest, AttributeIndexTest, TrigramIndexedSearchTest, TrigramIndexTest
+from graphIndexTest import IndexedFlatConnectingTest, IndexedNodeConnectingTest, IndexedDeleteAncestorTest, ClosureIndexTest, \
+    TopologicallyIndexedNodeConnectingTest, TopologicalOrderIndexTest, FinalMembersIndexedFlatConnectingTest, FinalMembersTest, \
+    FinalMembersIndexTest, CompactGraphNodeConnectingTest, CompactGraphTest
 
 tests = [
     NodeConnectingTest,
@@ -19,6 +34,34 @@ tests = [
     DeleteAncestorTest,
     ChangeTest,
     SearchTest,
+    PersistenceTest,
+    SqliteStorageTest,
+    SqliteSearchTest,
+    IndexedFlatConnectingTest,
+    IndexedNodeConnectingTest,
+    IndexedDeleteAncestorTest,
+    ClosureIndexTest,
+    TopologicallyIndexedNodeConnectingTest,
+    TopologicalOrderIndexTest,
+    FinalMembersIndexedFlatConnectingTest,
+    FinalMembersTest,
+    FinalMembersIndexTest,
+    CompactGraphNodeConnectingTest,
+    CompactGraphTest,
+    AttributeIndexedSearchTest,
+    AttributeIndexTest,
+    TrigramIndexedSearchTest,
+    TrigramIndexTest,
+    QueryPlannerTest,
+    ParallelSearchTest,
+    DaemonTest,
+    BatchTest,
+    LazyCliTest,
+    ImportTest,
+    ExportTest,
+    OrderedSetTest,
+    CompactNodeTest,
+    DetailedInfoTest,
 ]
 
 
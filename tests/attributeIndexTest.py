@@ -0,0 +1,110 @@
+import random
+import re
+
+from parameterized import parameterized
+
+import searchTest
+from abstractCategorierTest import AbstractCategorierTest
+from graphIndexTest import IndexedTestMixin
+from indexes import TrigramIndex
+from nodes import NodesManager
+
+
+class AttributeIndexedTestMixin(IndexedTestMixin):
+	index_switches = ('use_attribute_index', )
+
+
+class AttributeIndexedSearchTest(AttributeIndexedTestMixin, searchTest.SearchTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Attribute Indexed Search'
+
+
+class AttributeIndexTest(AttributeIndexedTestMixin, AbstractCategorierTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Attribute Index'
+
+	def setUp(self) -> None:
+		super().setUp()
+		NodesManager.add_nodes('Poland', 'Portugal', 'Peru')
+		for country, continent in zip(('Poland', 'Portugal', 'Peru'), ('Europe', 'Europe', 'America')):
+			NodesManager.get_node(country).put('continent', continent)
+
+	def find(self, key: str, pattern: str) -> set[str]:
+		NodesManager.get_data()
+		return NodesManager.get_attribute_index().find_names_by_value(key, re.compile(pattern))
+
+	@parameterized.expand([
+		('exact', '^Europe$', {'Poland', 'Portugal'}),
+		('prefix', '^Am', {'Peru'}),
+		('substring', 'ope', {'Poland', 'Portugal'}),
+		('missing', '^Asia$', set()),
+	])
+	def test_find_by_value(self, name: str, pattern: str, e_names: set[str]):
+		self.assertEqual(e_names, self.find('continent', pattern))
+
+	def test_follows_changes(self):
+		self.find('continent', '^Europe$')
+		NodesManager.get_node('Poland').put('continent', 'Asia')
+		NodesManager.delete_node('Portugal')
+		NodesManager.add_node('Spain').put('continent', 'Europe')
+
+		self.assertEqual({'Spain'}, self.find('continent', '^Europe$'))
+		self.assertEqual({'Poland'}, self.find('continent', '^As'))
+
+	def test_follows_list_changes(self):
+		self.find('continent', '^Europe$')
+		NodesManager.get_node('Peru').descriptions.append('Andes')
+		NodesManager.get_node('Peru').descriptions.append('Amazon')
+
+		self.assertEqual({'Peru'}, self.find('descriptions', '^Amazon$'))
+		NodesManager.get_node('Peru').descriptions.remove('Amazon')
+		self.assertEqual(set(), self.find('descriptions', '^Amazon$'))
+		self.assertEqual({'Poland', 'Portugal'}, NodesManager.get_attribute_index().find_names_without('descriptions'))
+
+
+class TrigramIndexedTestMixin(IndexedTestMixin):
+	index_switches = ('use_trigram_index', )
+
+
+class TrigramIndexedSearchTest(TrigramIndexedTestMixin, searchTest.SearchTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Trigram Indexed Search'
+
+
+class TrigramIndexTest(AbstractCategorierTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Trigram Index'
+
+	texts = 'Poland', 'Portugal', 'Czechia', 'Peru', 'Colombia', 'Chile', 'Polynesia', 'Estonia', 'Slovenia'
+
+	def setUp(self) -> None:
+		super().setUp()
+		self.index = TrigramIndex()
+		for text in self.texts:
+			self.index.add(text)
+
+	@parameterized.expand([
+		('literal', 'land', {'Poland'}),
+		('literal_in_regex', r'^Po.*gal$', {'Portugal'}),
+		('branch', 'Chil|Peru', {'Chile', 'Peru'}),
+		('required_repeat', '(?:nia)+$', {'Estonia', 'Slovenia'}),
+		('optional_repeat', 'x?', set(texts)),
+		('too_short', 'Po', set(texts)),
+		('ignored_case', '(?i)POLAND', set(texts)),
+	])
+	def test_candidates(self, name: str, pattern: str, e_candidates: set[str]):
+		self.assertEqual(e_candidates, set(self.index.get_candidates(re.compile(pattern))))
+
+	def test_candidates_contain_every_match(self):
+		rng = random.Random(0)
+		patterns = 'oni', 'a$', r'l\w+a', 'e(ru|ch)', '(?:Col|Est)o', 'ia|and', '[PC]o', 'o.i'
+		for _ in range(3):
+			self.index.remove(rng.choice(self.texts))
+		for pattern in map(re.compile, patterns):
+			candidates = set(self.index.get_candidates(pattern))
+			matches = {text for text in self.index.get_candidates(re.compile('')) if pattern.search(text)}
+			self.assertLessEqual(matches, candidates)
@@ -0,0 +1,99 @@
+from unittest.mock import patch
+
+from parameterized import parameterized
+
+from abstractCategorierTest import AbstractCategorierTest
+from batch import BatchRunner, DaemonBatchRunner, parse_batch_args
+from categorierCli import Keywords as K
+from client import DAEMON_DISCONNECTED
+from nodes import NodesManager
+
+
+class BatchTest(AbstractCategorierTest):
+
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Batch'
+
+	def setUp(self) -> None:
+		super().setUp()
+		self.reported = []
+		self.runner = BatchRunner(self.cli, report=lambda line_number, error: self.reported.append((line_number, error)))
+
+	def test_commands_share_one_load(self):
+		lines = [f'{K.ADD} Europe', f'{K.ADD} Poland {K.WITH_PARENTS} Europe', f'{K.ADD} Peru']
+		with patch.object(NodesManager, 'save_data') as save_data:
+			summary = self.runner.run(lines)
+
+		self.assertEqual(3, summary.executed)
+		self.assertEqual([], summary.errors)
+		self.assertEqual(1, save_data.call_count)
+		self.assertCountEqual(['Poland'], NodesManager.get_node('Europe').children.get_all())
+
+	def test_changes_are_saved(self):
+		self.runner.run([f'{K.ADD} Chile'])
+
+		NodesManager.load_data(self.test_path)
+		self.assertTrue(NodesManager.is_in_data('Chile'))
+
+	def test_existing_node_is_reported_and_batch_goes_on(self):
+		summary = self.runner.run([f'{K.ADD} Chile', f'{K.ADD} Chile', f'{K.ADD} Peru'])
+
+		self.assertEqual([(2, 'Node "Chile" already exists')], summary.errors)
+		self.assertEqual(summary.errors, self.reported)
+		self.assertTrue(NodesManager.is_in_data('Peru'))
+
+	def test_failed_command_is_reported(self):
+		summary = self.runner.run([f'{K.SHOW} Atlantis', f'{K.ADD} Peru'])
+
+		self.assertEqual([1], [line_number for line_number, _ in summary.errors])
+		self.assertTrue(NodesManager.is_in_data('Peru'))
+
+	def test_failed_line_is_rolled_back(self):
+		summary = self.runner.run([f'{K.ADD} a', f'{K.ADD} b', f'{K.ADD} c b', f'{K.CAT} b a c', f'{K.ADD} d'])
+
+		self.assertEqual([4], [line_number for line_number, _ in summary.errors])
+		self.assertEqual([], list(NodesManager.get_node('b').parents.get_names()))
+		self.assertTrue(NodesManager.is_in_data('d'))
+		NodesManager.load_data(self.test_path)
+		self.assertEqual([], list(NodesManager.get_node('b').parents.get_names()))
+		self.assertCountEqual(['a', 'b', 'c', 'd'], NodesManager.get_all_names())
+
+	def test_repeated_page_is_parsed_again(self):
+		NodesManager.add_nodes('Chile', 'Peru', 'Poland', 'Spain')
+		page = f'{K.SHOW} {K.ALL} {K.LIMIT} 2 {K.OFFSET} 2'
+
+		summary = self.runner.run([page, page])
+
+		self.assertEqual(2, summary.executed)
+		self.assertEqual([], summary.errors)
+
+	@parameterized.expand([
+		('no_response', None),
+		('empty_response', {}),
+	])
+	def test_daemon_disconnection_is_reported(self, name: str, response: dict | None):
+		runner = DaemonBatchRunner(report=lambda line_number, error: self.reported.append((line_number, error)))
+		with patch('client.run_command', return_value=response):
+			summary = runner.run([f'{K.ADD} Chile', f'{K.ADD} Peru'])
+
+		self.assertEqual(2, summary.executed)
+		self.assertEqual([(1, DAEMON_DISCONNECTED), (2, DAEMON_DISCONNECTED)], summary.errors)
+
+	def test_save_every(self):
+		self.runner.save_every = 2
+		with patch.object(NodesManager, 'save_data') as save_data:
+			self.runner.run([f'{K.ADD} {name}' for name in ('Chile', 'Peru', 'Poland', 'Spain', 'Italy')])
+
+		self.assertEqual(3, save_data.call_count)
+
+	def test_blank_lines_and_comments_are_skipped(self):
+		summary = self.runner.run(['# countries', '', f'{K.ADD} Chile  # in South America', '   '])
+
+		self.assertEqual(1, summary.executed)
+		self.assertEqual([], summary.errors)
+		self.assertTrue(NodesManager.is_in_data('Chile'))
+
+	def test_parse_batch_args(self):
+		self.assertEqual((None, None), parse_batch_args([]))
+		self.assertEqual(('commands.txt', 50), parse_batch_args(['--save-every', '50', 'commands.txt']))
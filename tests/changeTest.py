@@ -2,6 +2,7 @@ from parameterized import parameterized
 
 from abstractCategorierTest import AbstractCategorierTest
 from categorierCli import Keywords as K
+from exceptions import NodeExistsInDataBase
 from nodes import NodesManager
 
 
@@ -21,6 +22,67 @@ class ChangeTest(AbstractCategorierTest):
 
 		self.cli.parse(f'm {change_command} {node_name} {new_name}')
 
+		self.assertFalse(NodesManager.is_in_data(node_name))
+		self.assertTrue(NodesManager.is_in_data(new_name))
+
+	def test_rename_rewrites_neighbours(self):
+		NodesManager.add_nodes('Europe', 'Slavic')
+		NodesManager.add_nodes('Spain', 'Poland', 'Italy', all_parents=[['Europe']] * 3)
+		NodesManager.add_node('Warsaw', parents=['Poland'])
+		NodesManager.get_node('Poland').add_parents('Slavic')
+		NodesManager.get_node('Poland')['capital'] = 'Warsaw'
+
+		self.cli.parse(f'm {K.RENAME} Poland Polska')
+		NodesManager.save_data()
+		NodesManager.load_data(self.test_path)
+
+		self.assertFalse(NodesManager.is_in_data('Poland'))
+		self.assertEqual(['Spain', 'Polska', 'Italy'], NodesManager.get_node('Europe').children.get_all())
+		self.assertEqual(['Polska'], NodesManager.get_node('Slavic').children.get_all())
+		self.assertEqual(['Polska'], NodesManager.get_node('Warsaw').parents.get_all())
+		polska = NodesManager.get_node('Polska')
+		self.assertEqual(['Europe', 'Slavic'], polska.parents.get_all())
+		self.assertEqual('Warsaw', polska['capital'])
+
+	def test_rename_to_existing_name_changes_nothing(self):
+		NodesManager.add_node('Europe', children=[NodesManager.add_node('Poland').name])
+		NodesManager.add_node('Spain')
+
+		with self.assertRaises(NodeExistsInDataBase):
+			NodesManager.rename_node('Poland', 'Spain')
+
+		self.assertEqual(['Poland'], NodesManager.get_node('Europe').children.get_all())
+		self.assertTrue(NodesManager.is_in_data('Poland'))
+
+	@parameterized.expand([
+		('closure', 'use_closure_index'),
+		('topological', 'use_topological_index'),
+		('final_members', 'use_final_members_index'),
+		('compact_graph', 'use_compact_graph'),
+		('attribute', 'use_attribute_index'),
+	])
+	def test_rename_keeps_indexes(self, name: str, switch: str):
+		setattr(NodesManager, switch, True)
+		try:
+			NodesManager.add_node('Europe')
+			NodesManager.add_node('Poland', parents=['Europe'])
+			NodesManager.add_node('Warsaw', parents=['Poland'])
+			warsaw = NodesManager.get_node('Warsaw')
+			europe = NodesManager.get_node('Europe')
+			list(warsaw.get_all_ancestors_names()), list(europe.get_final_descendants()), list(NodesManager.search_node([K.MEMO], ['P']))
+
+			NodesManager.rename_node('Poland', 'Polska')
+			NodesManager.rename_node('Warsaw', 'Warszawa')
+
+			warszawa = NodesManager.get_node('Warszawa')
+			self.assertCountEqual(['Polska', 'Europe'], warszawa.get_all_ancestors_names())
+			self.assertEqual(['Warszawa'], list(europe.get_final_descendants()))
+			self.assertEqual(['Europe'], list(warszawa.get_final_ancestors()))
+			self.assertTrue(warszawa.parents.has_in_flattened_members('Europe'))
+			self.assertEqual(['Polska'], [node.name for node in NodesManager.search_node([K.MEMO], ['^Pol'])])
+		finally:
+			setattr(NodesManager, switch, False)
+
 	@parameterized.expand([
 		('just_change', 'firstname', 'name', 'Pavel',  K.CHANGE),
 		('rename', 'firstname', 'name', 'Pavel', f'{K.RENAME}'),
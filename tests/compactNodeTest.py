@@ -0,0 +1,50 @@
+from abstractCategorierTest import AbstractCategorierTest
+from nodes import NO_MEMBERS, Node, NodesManager
+
+
+class CompactNodeTest(AbstractCategorierTest):
+
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Compact node'
+
+	def test_nodes_have_no_instance_dict(self):
+		node = NodesManager.add_node('Poland')
+
+		for instance in (node, node.parents, node.children):
+			self.assertFalse(hasattr(instance, '__dict__'), type(instance).__name__)
+
+	def test_empty_members_are_shared_until_added(self):
+		NodesManager.add_node('Europe')
+		poland = NodesManager.add_node('Poland')
+		self.assertIs(NO_MEMBERS, poland.parents._values)
+
+		poland.add_parents('Europe')
+
+		self.assertEqual(['Europe'], poland.parents.get_all())
+		self.assertEqual(0, len(NO_MEMBERS))
+		self.assertIs(NO_MEMBERS, NodesManager.get_node('Europe').parents._values)
+
+	def test_cleared_members_are_shared_again(self):
+		NodesManager.add_node('Europe')
+		poland = NodesManager.add_node('Poland', parents=['Europe'])
+		poland.parents = []
+
+		self.assertIs(NO_MEMBERS, poland.parents._values)
+
+	def test_descriptions_are_created_when_read(self):
+		NodesManager.add_node('Poland')
+		NodesManager.save_active_nodes()
+		poland = NodesManager.get_node('Poland')
+		self.assertNotIn('descriptions', poland)
+
+		poland.descriptions.append('Vistula')
+
+		self.assertEqual({'descriptions': ['Vistula']}, poland.to_data())
+
+	def test_loaded_node_keeps_its_data(self):
+		data = {'parents': ['Europe'], 'children': ['Warsaw'], 'descriptions': ['Vistula'], 'capital': 'Warsaw'}
+		node = NodesManager.create_node_from_data('Poland', data)
+
+		self.assertIsInstance(node, Node)
+		self.assertEqual(data, node.to_data())
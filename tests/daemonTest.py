@@ -0,0 +1,127 @@
+import socket
+import time
+from threading import Thread
+
+from parameterized import parameterized
+
+from abstractCategorierTest import AbstractCategorierTest
+from categorierCli import Keywords as K
+from client import is_daemon_running, read_message, read_messages, run_command, stop_daemon, write_message
+from daemon import Daemon
+from exceptions import DaemonAlreadyRunning
+from nodes import NodesManager, Paths
+
+
+class DaemonTest(AbstractCategorierTest):
+	socket_path = Paths.RESOURCES / 'test_data.yml.sock'
+	startup_timeout = 5.0
+
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Daemon'
+
+	def setUp(self) -> None:
+		super().setUp()
+		NodesManager.add_nodes('Poland', 'Peru')
+		NodesManager.save_data()
+		self.daemon = Daemon(self.socket_path, self.test_path)
+		self.thread = Thread(target=self.daemon.serve, daemon=True)  # a daemon that never came up must not keep the run alive
+		self.thread.start()
+		deadline = time.monotonic() + self.startup_timeout
+		while not is_daemon_running(self.socket_path):
+			if time.monotonic() > deadline or not self.thread.is_alive():
+				self.fail('The daemon did not start')
+			time.sleep(0.01)
+
+	def tearDown(self) -> None:
+		stop_daemon(self.socket_path)
+		self.thread.join()
+		for switch in Daemon.index_switches:
+			setattr(NodesManager, switch, False)
+		super().tearDown()
+
+	def run_command(self, command: str) -> dict:
+		return run_command(['m', *command.split()], self.socket_path)
+
+	def test_commands_share_loaded_state(self):
+		self.assertEqual({'lines': [], 'error': None}, self.run_command(f'{K.ADD} Portugal'))
+		response = self.run_command(f'{K.SEARCH} P')
+
+		self.assertEqual(['1) Poland', '2) Peru', '3) Portugal'], response['lines'])
+
+	def test_changes_are_saved(self):
+		self.run_command(f'{K.ADD} Chile')
+		stop_daemon(self.socket_path)
+		self.thread.join()
+
+		NodesManager.load_data(self.test_path)
+		self.assertTrue(NodesManager.is_in_data('Chile'))
+
+	def test_failed_command_is_reported_and_dropped(self):
+		response = self.run_command(f'{K.SHOW} Atlantis')
+		self.assertIsNotNone(response['error'])
+
+		response = self.run_command(f'{K.SHOW}')
+		self.assertEqual(['1) Poland', '2) Peru'], response['lines'])
+
+	def test_repeated_page_is_parsed_again(self):
+		self.run_command(f'{K.ADD} Chile')
+		page = f'{K.SHOW} {K.ALL} {K.LIMIT} 1 {K.OFFSET} 1'
+
+		for _ in range(2):
+			self.assertEqual({'lines': ['2) Peru'], 'error': None}, self.run_command(page))
+
+	def test_output_is_streamed_line_by_line(self):
+		with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+			connection.connect(str(self.socket_path))
+			write_message(connection, {'argv': ['m', K.EXPORT]})
+			messages = list(read_messages(connection))
+
+		self.assertEqual([{'line': '{"name": "Poland"}'}, {'line': '{"name": "Peru"}'}, {'error': None}], messages)
+
+	def test_streamed_lines_go_to_the_callback(self):
+		lines = []
+		response = run_command(['m', K.SHOW], self.socket_path, on_line=lines.append)
+
+		self.assertEqual({'lines': [], 'error': None}, response)
+		self.assertEqual(['1) Poland', '2) Peru'], lines)
+
+	def test_paths_are_relative_to_the_client(self):
+		path = self.test_path.with_name(f'{self.test_path.name}.import.jsonl')
+		path.write_text('{"name": "Chile"}\n', encoding='utf-8')
+
+		response = run_command(['m', K.IMPORT, path.name], self.socket_path, cwd=str(path.parent))
+
+		self.assertIsNone(response['error'])
+		self.assertEqual(['1) Poland', '2) Peru', '3) Chile'], self.run_command(f'{K.SHOW}')['lines'])
+
+	def test_existing_node_is_reported(self):
+		response = self.run_command(f'{K.ADD} Peru')
+		self.assertEqual('Node "Peru" already exists', response['error'])
+
+	def test_silent_client_does_not_block_others(self):
+		self.daemon.request_timeout = 0.1
+		with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as silent:
+			silent.connect(str(self.socket_path))
+			response = self.run_command(f'{K.SHOW}')
+
+		self.assertEqual(['1) Poland', '2) Peru'], response['lines'])
+
+	@parameterized.expand([
+		('not_json', b'not json\n'),
+		('not_utf8', b'\xff\n'),
+		('not_an_object', b'[1]\n'),
+		('argv_not_a_list', b'{"argv": "show"}\n'),
+	])
+	def test_bad_request_is_answered(self, name: str, request: bytes):
+		with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+			connection.connect(str(self.socket_path))
+			connection.sendall(request)
+			response = read_message(connection)
+
+		self.assertTrue(response['error'].startswith('Bad request'))
+		self.assertEqual(['1) Poland', '2) Peru'], self.run_command(f'{K.SHOW}')['lines'])
+
+	def test_second_daemon_is_refused(self):
+		with self.assertRaises(DaemonAlreadyRunning):
+			Daemon(self.socket_path, self.test_path).serve()
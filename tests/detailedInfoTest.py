@@ -0,0 +1,79 @@
+from unittest.mock import patch
+
+from parameterized import parameterized
+from smartcli.nodes.smartList import SmartList
+
+from abstractCategorierTest import AbstractCategorierTest
+from categorierCli import Keywords as K
+from nodes import NodesManager
+
+
+class DetailedInfoTest(AbstractCategorierTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Detailed info'
+
+	def setUp(self) -> None:
+		super().setUp()
+		NodesManager.add_node('r')
+		NodesManager.add_node('a', parents=['r'])
+		NodesManager.add_node('b', parents=['r'])
+		NodesManager.add_node('c', parents=['a', 'b'])
+		NodesManager.add_node('d', parents=['c'])
+		self.lines = SmartList()
+		self.cli.set_out_stream(self.lines.__iadd__)
+
+	def test_lines(self):
+		node = NodesManager.get_node('c')
+		node['tags'] = ['x', 'y']
+		node['year'] = 1999
+
+		self.cli.parse(f'm {K.SHOW} c')
+
+		self.assertEqual([
+			'Name: c',
+			'Parents:  a, b',
+			'Children: d',
+			'Ancestors:   b, r, a',
+			'Descendants: d',
+			'tags:',
+			'    1) x',
+			'    2) y',
+			'year: 1999',
+			'',
+		], list(self.lines))
+
+	@parameterized.expand([
+		('depth', f'{K.DEPTH} 1', 'Descendants: a, b'),
+		('deeper', f'{K.DEPTH} 2', 'Descendants: a, b, c'),
+		('max_items', f'{K.MAX_ITEMS} 2', 'Descendants: b, c, ...'),
+		('both', f'{K.DEPTH} 3 {K.MAX_ITEMS} 3', 'Descendants: a, b, c, ...'),
+		('max_items_not_reached', f'{K.DEPTH} 2 {K.MAX_ITEMS} 3', 'Descendants: a, b, c'),
+		('equal_limits', f'{K.DEPTH} 2 {K.MAX_ITEMS} 2', 'Descendants: a, b, ...'),
+	])
+	def test_limits(self, name: str, limits: str, e_line: str):
+		self.cli.parse(f'm {K.SHOW} r {limits}')
+
+		self.assertIn(e_line, self.lines)
+		self.assertIn('Children: a, b', self.lines)
+
+	def test_max_items_stops_the_walk(self):
+		NodesManager.add_nodes(*(f'n{i}' for i in range(1000)))
+		for i in range(1000):
+			NodesManager.get_node(f'n{i}').add_parents('d')
+
+		with patch.object(NodesManager, 'get_member_names', wraps=NodesManager.get_member_names) as get_member_names:
+			self.cli.parse(f'm {K.SHOW} r {K.DEPTH} 10 {K.MAX_ITEMS} 5')
+
+		self.assertIn('Descendants: a, b, c, d, n0, ...', self.lines)
+		self.assertLess(get_member_names.call_count, 20)
+
+	def test_same_limits_twice(self):
+		command = f'm {K.SHOW} r {K.DEPTH} 2 {K.MAX_ITEMS} 2'
+		self.cli.parse(command)
+		first = list(self.lines)
+		self.lines.clear()
+
+		self.cli.parse(command)
+
+		self.assertEqual(first, list(self.lines))
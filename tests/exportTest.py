@@ -0,0 +1,90 @@
+import json
+from unittest.mock import patch
+
+from parameterized import parameterized
+
+from abstractCategorierTest import AbstractCategorierTest
+from categorierCli import Keywords as K
+from nodes import NodesManager
+from transfer import ExportRecords, export_lines, format_csv, get_export_records, import_file
+
+
+class ExportTest(AbstractCategorierTest):
+
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Export'
+
+	def setUp(self) -> None:
+		super().setUp()
+		NodesManager.add_nodes('Europe', 'Slavic')
+		NodesManager.add_node('Poland', parents=['Europe', 'Slavic'], descriptions=['Vistula'])
+		NodesManager.add_node('Spain', parents=['Europe'])
+		NodesManager.get_node('Poland')['capital'] = 'Warsaw'
+
+	def test_jsonl(self):
+		records = list(map(json.loads, export_lines('jsonl')))
+
+		self.assertEqual(['Europe', 'Slavic', 'Poland', 'Spain'], [record['name'] for record in records])
+		self.assertEqual({'name': 'Poland', 'parents': ['Europe', 'Slavic'], 'descriptions': ['Vistula'], 'capital': 'Warsaw'}, records[2])
+
+	def test_csv(self):
+		NodesManager.add_node('Asia')['capital'] = 'none'
+
+		self.assertEqual([
+			'name,parents,children,descriptions,capital',
+			'Europe,,Poland;Spain,,',
+			'Slavic,,Poland,,',
+			'Poland,Europe;Slavic,,Vistula,Warsaw',
+			'Spain,Europe,,,',
+			'Asia,,,,none',
+		], list(export_lines('csv')))
+
+	def test_csv_walks_the_records_twice_instead_of_copying_them(self):
+		records = ExportRecords()
+		with patch('transfer.get_export_records', wraps=get_export_records) as walk:
+			lines = list(format_csv(records))
+
+		self.assertEqual(2, walk.call_count)
+		self.assertEqual(lines, list(format_csv(get_export_records())))
+
+	@parameterized.expand([
+		('csv', '.csv'),
+		('jsonl', '.jsonl'),
+		('yaml', '.yml'),
+	])
+	def test_reads_back(self, format: str, suffix: str):
+		NodesManager.add_node('Asia')['capital'] = 'none'
+		path = self.test_path.with_name(f'{self.test_path.name}.export{suffix}')
+		path.write_text('\n'.join(export_lines(format)) + '\n', encoding='utf-8')
+		exported = NodesManager.get_data().copy()
+
+		NodesManager.load_data(path.with_name(f'{self.test_path.name}.imported.yml'))
+		import_file(path)
+
+		self.assertEqual(exported, NodesManager.get_data())
+
+	def test_subtree_keeps_members_inside(self):
+		records = {record.pop('name'): record for record in map(json.loads, export_lines('jsonl', ['Europe']))}
+
+		self.assertEqual(['Europe', 'Spain', 'Poland'], list(records))
+		self.assertEqual(['Europe'], records['Poland']['parents'])
+		self.assertEqual(['Poland', 'Spain'], records['Europe']['children'])
+
+	def test_export_is_lazy(self):
+		lines = export_lines('jsonl')
+		self.assertEqual('Europe', json.loads(next(lines))['name'])
+
+	def test_unknown_format(self):
+		with self.assertRaises(ValueError):
+			export_lines('xml')
+
+	def test_export_command(self):
+		lines = []
+		self.cli.set_out_stream(lines.append)
+		try:
+			self.cli.parse(f'm {K.EXPORT} csv {K.FROM} Slavic')
+		finally:
+			self.cli.set_out_stream(print)
+
+		self.assertEqual(['name,parents,children,descriptions,capital', 'Slavic,,Poland,,', 'Poland,Slavic,,Vistula,Warsaw'], lines)
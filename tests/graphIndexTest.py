@@ -0,0 +1,251 @@
+import random
+
+from parameterized import parameterized
+
+import deleteAncestorTest
+import flatConnectingTest
+import nodeConnectingTest
+from abstractCategorierTest import AbstractCategorierTest
+from graph import CompactAdjacency
+from nodes import NodesManager, NodesStorageField, ParentNodesStorageField
+
+
+class IndexedTestMixin:
+	index_switches = ('use_closure_index', )
+
+	def setUp(self) -> None:
+		super().setUp()
+		for switch in self.index_switches:
+			setattr(NodesManager, switch, True)
+
+	def tearDown(self) -> None:
+		for switch in self.index_switches:
+			setattr(NodesManager, switch, False)
+		super().tearDown()
+
+
+class TopologicallyIndexedTestMixin(IndexedTestMixin):
+	index_switches = ('use_topological_index', )
+
+
+class FinalMembersIndexedTestMixin(IndexedTestMixin):
+	index_switches = ('use_final_members_index', )
+
+
+class CompactGraphTestMixin(IndexedTestMixin):
+	index_switches = ('use_compact_graph', )
+
+
+class IndexedFlatConnectingTest(IndexedTestMixin, flatConnectingTest.FlatConnectingTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Indexed Flat Connecting'
+
+
+class FinalMembersIndexedFlatConnectingTest(FinalMembersIndexedTestMixin, flatConnectingTest.FlatConnectingTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Final Members Indexed Flat Connecting'
+
+
+class IndexedNodeConnectingTest(IndexedTestMixin, nodeConnectingTest.NodeConnectingTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Indexed Node Connecting'
+
+
+class TopologicallyIndexedNodeConnectingTest(TopologicallyIndexedTestMixin, nodeConnectingTest.NodeConnectingTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Topologically Indexed Node Connecting'
+
+
+class CompactGraphNodeConnectingTest(CompactGraphTestMixin, nodeConnectingTest.NodeConnectingTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Compact Graph Node Connecting'
+
+
+class IndexedDeleteAncestorTest(IndexedTestMixin, deleteAncestorTest.DeleteAncestorTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Indexed Delete Just Ancestor'
+
+
+class ClosureIndexTest(IndexedTestMixin, AbstractCategorierTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Closure Index'
+
+	def assert_index_matches_walk(self):
+		for node in NodesManager.get_all_nodes():
+			for field in (node.parents, node.children):
+				self.assertCountEqual(list(field._walk_member_names()), list(field.get_all_member_names_flattened()))
+
+	@parameterized.expand([
+		('built_before_changes', True),
+		('built_after_changes', False),
+	])
+	def test_random_changes(self, name: str, build_first: bool):
+		rng = random.Random(0)
+		names = [f'n{i}' for i in range(30)]
+		NodesManager.add_nodes(*names)
+		if build_first:
+			NodesManager.get_closure_index()
+
+		for _ in range(150):
+			parent, child = sorted(rng.sample(names, 2), key=names.index)
+			node = NodesManager.get_node(child)
+			if parent in node.parents:
+				node.remove_parents(parent)
+			else:
+				node.add_parents(parent)
+		for deleted in rng.sample(names, 5):
+			NodesManager.delete_node(deleted)
+		NodesManager.delete_nodes(*rng.sample([name for name in names[1:] if NodesManager.is_in_data(name)], 8))
+
+		self.assert_index_matches_walk()
+
+	def test_field_without_index_hooks_is_refused(self):
+		class IncompleteField(ParentNodesStorageField):
+			__slots__ = ()
+			_get_compact_closure = NodesStorageField._get_compact_closure
+
+		with self.assertRaises(TypeError):
+			IncompleteField()
+
+	def test_cycle_is_rejected(self):
+		NodesManager.add_node('a')
+		NodesManager.add_node('b', parents=['a'])
+		NodesManager.add_node('c', parents=['b'])
+
+		with self.assertRaises(ValueError):
+			NodesManager.get_node('a').add_parents('c')
+
+
+class TopologicalOrderIndexTest(TopologicallyIndexedTestMixin, AbstractCategorierTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Topological Order Index'
+
+	def test_random_insertions(self):
+		rng = random.Random(0)
+		names = [f'n{i}' for i in range(40)]
+		NodesManager.add_nodes(*names)
+		index = NodesManager.get_topological_index()
+
+		for _ in range(300):
+			parent, child = rng.sample(names, 2)
+			child_node = NodesManager.get_node(child)
+			e_cycle = parent in child_node.children._walk_member_names()
+			try:
+				child_node.add_parents(parent)
+				a_cycle = False
+			except ValueError:
+				a_cycle = True
+			self.assertEqual(e_cycle, a_cycle)
+
+		for node in NodesManager.get_all_nodes():
+			for child in node.children.get_names():
+				self.assertLess(index.get_order(node.name), index.get_order(child))
+
+
+class FinalMembersTest(AbstractCategorierTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Final Members'
+
+	def test_diamond_is_walked_once(self):
+		NodesManager.add_node('root')
+		NodesManager.add_nodes('l1', 'r1', all_parents=[['root'], ['root']])
+		for i in range(2, 20):
+			NodesManager.add_nodes(f'l{i}', f'r{i}', all_parents=[[f'l{i-1}', f'r{i-1}'], [f'l{i-1}', f'r{i-1}']])
+		NodesManager.add_node('leaf', parents=['l19', 'r19'])
+
+		self.assertEqual(['root'], list(NodesManager.get_node('leaf').get_final_ancestors()))
+		self.assertEqual(['leaf'], list(NodesManager.get_node('root').get_final_descendants()))
+
+	def test_final_descendants_are_leaves(self):
+		NodesManager.add_node('a')
+		NodesManager.add_nodes('b', 'c', all_parents=[['a'], ['a']])
+		NodesManager.add_node('d', parents=['b'])
+
+		self.assertCountEqual(['c', 'd'], list(NodesManager.get_node('a').get_final_descendants()))
+		self.assertEqual(['a'], list(NodesManager.get_node('d').get_final_ancestors()))
+
+
+class FinalMembersIndexTest(FinalMembersIndexedTestMixin, FinalMembersTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Final Members Index'
+
+	def assert_index_matches_walk(self):
+		for node in NodesManager.get_all_nodes():
+			for field in (node.parents, node.children):
+				self.assertCountEqual(list(field._walk_final_member_names()), list(field.get_final_members()))
+		self.assertCountEqual([n for n in NodesManager.get_all_names() if not NodesManager.get_parent_names(n)], NodesManager.get_root_names())
+		self.assertCountEqual([n for n in NodesManager.get_all_names() if not NodesManager.get_child_names(n)], NodesManager.get_leaf_names())
+
+	def test_random_changes(self):
+		rng = random.Random(0)
+		names = [f'n{i}' for i in range(30)]
+		NodesManager.add_nodes(*names)
+		NodesManager.get_final_members_index()
+
+		for step in range(150):
+			parent, child = sorted(rng.sample(names, 2), key=names.index)
+			node = NodesManager.get_node(child)
+			if parent in node.parents:
+				node.remove_parents(parent)
+			else:
+				node.add_parents(parent)
+			if not step % 10:
+				self.assert_index_matches_walk()
+		for deleted in rng.sample(names, 5):
+			NodesManager.delete_node(deleted)
+		NodesManager.delete_nodes(*rng.sample([name for name in names[1:] if NodesManager.is_in_data(name)], 8))
+		NodesManager.add_node('new', parents=[names[0]])
+
+		self.assert_index_matches_walk()
+
+
+class CompactGraphTest(CompactGraphTestMixin, AbstractCategorierTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Compact Graph'
+
+	def setUp(self) -> None:
+		super().setUp()
+		CompactAdjacency.compaction_threshold = 4
+
+	def tearDown(self) -> None:
+		CompactAdjacency.compaction_threshold = 64
+		super().tearDown()
+
+	def assert_graph_matches_walk(self):
+		for node in NodesManager.get_all_nodes():
+			for field in (node.parents, node.children):
+				self.assertCountEqual(list(field._walk_member_names()), list(field.get_all_member_names_flattened()))
+				self.assertCountEqual(list(field._walk_final_member_names()), list(field.get_final_members()))
+
+	def test_random_changes(self):
+		rng = random.Random(0)
+		names = [f'n{i}' for i in range(30)]
+		NodesManager.add_nodes(*names)
+		NodesManager.get_compact_graph()
+
+		for step in range(150):
+			parent, child = sorted(rng.sample(names, 2), key=names.index)
+			node = NodesManager.get_node(child)
+			if parent in node.parents:
+				node.remove_parents(parent)
+			else:
+				node.add_parents(parent)
+			if not step % 10:
+				self.assert_graph_matches_walk()
+		for deleted in rng.sample(names, 5):
+			NodesManager.delete_node(deleted)
+		NodesManager.delete_nodes(*rng.sample([name for name in names[1:] if NodesManager.is_in_data(name)], 8))
+		NodesManager.add_node('new', parents=[names[0]])
+
+		self.assert_graph_matches_walk()
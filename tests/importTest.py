@@ -0,0 +1,109 @@
+import json
+
+from parameterized import parameterized
+
+from abstractCategorierTest import AbstractCategorierTest
+from categorierCli import Keywords as K
+from nodes import NodesManager
+from transfer import import_file, read_records
+
+
+class ImportTest(AbstractCategorierTest):
+
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Import'
+
+	def write_records(self, suffix: str, content: str):
+		path = self.test_path.with_name(f'{self.test_path.name}.import{suffix}')
+		path.write_text(content, encoding='utf-8')
+		return path
+
+	def write_jsonl(self, *records: dict):
+		return self.write_records('.jsonl', '\n'.join(map(json.dumps, records)))
+
+	@parameterized.expand([
+		('csv', '.csv', 'name,parents,capital\nEurope,,\nPoland,Europe,Warsaw\nSpain,Europe;Romance,Madrid\nRomance,,\n'),
+		('jsonl', '.jsonl', '{"name": "Europe"}\n{"name": "Poland", "parents": "Europe", "capital": "Warsaw"}\n\n'
+							'{"name": "Spain", "parents": ["Europe", "Romance"], "capital": "Madrid"}\n{"name": "Romance"}\n'),
+		('yaml', '.yml', 'Europe:\nPoland:\n  parents: Europe\n  capital: Warsaw\nSpain:\n  parents: [Europe, Romance]\n  capital: Madrid\nRomance: {}\n'),
+	])
+	def test_import(self, name: str, suffix: str, content: str):
+		summary = import_file(self.write_records(suffix, content))
+
+		self.assertTrue(summary.is_imported)
+		self.assertEqual((4, 3), (summary.added, summary.edges))
+		self.assertCountEqual(['Poland', 'Spain'], NodesManager.get_node('Europe').children.get_all())
+		self.assertEqual(['Europe', 'Romance'], NodesManager.get_node('Spain').parents.get_all())
+		self.assertEqual('Warsaw', NodesManager.get_node('Poland')['capital'])
+
+	def test_import_connects_to_existing_nodes(self):
+		NodesManager.add_node('Europe', children=[NodesManager.add_node('Italy').name])
+		import_file(self.write_jsonl({'name': 'Poland', 'parents': ['Europe']}, {'name': 'Slavic', 'children': ['Poland']}))
+
+		self.assertEqual(['Italy', 'Poland'], NodesManager.get_node('Europe').children.get_all())
+		self.assertEqual(['Europe', 'Slavic'], NodesManager.get_node('Poland').parents.get_all())
+
+	def test_duplicates_are_skipped(self):
+		NodesManager.add_node('Poland')
+		summary = import_file(self.write_jsonl({'name': 'Poland', 'capital': 'Warsaw'}, {'name': 'Peru'}, {'name': 'Peru', 'capital': 'Lima'}))
+
+		self.assertEqual(['Poland', 'Peru'], summary.duplicates)
+		self.assertEqual(1, summary.added)
+		self.assertNotIn('capital', NodesManager.get_node('Poland'))
+		self.assertNotIn('capital', NodesManager.get_node('Peru'))
+
+	def test_edges_to_unknown_nodes_are_skipped(self):
+		summary = import_file(self.write_jsonl({'name': 'Poland', 'parents': ['Atlantis']}))
+
+		self.assertEqual(['Atlantis'], summary.missing)
+		self.assertEqual((1, 0), (summary.added, summary.edges))
+		self.assertEqual([], NodesManager.get_node('Poland').parents.get_all())
+
+	def test_cycle_rejects_whole_import(self):
+		NodesManager.add_node('Europe', children=[NodesManager.add_node('Poland').name])
+		summary = import_file(self.write_jsonl(
+			{'name': 'Peru'},
+			{'name': 'Slavic', 'parents': ['Poland'], 'children': ['Europe']},
+		))
+
+		self.assertFalse(summary.is_imported)
+		self.assertEqual(['Europe', 'Poland', 'Slavic'], summary.cycle)
+		self.assertFalse(NodesManager.is_in_data('Peru'))
+		self.assertEqual([], NodesManager.get_node('Europe').parents.get_all())
+
+	def test_import_is_saved(self):
+		import_file(self.write_jsonl({'name': 'Europe'}, {'name': 'Poland', 'parents': ['Europe']}))
+		NodesManager.save_data()
+
+		NodesManager.load_data(self.test_path)
+		self.assertEqual(['Poland'], NodesManager.get_node('Europe').children.get_all())
+
+	def test_import_keeps_indexes_in_sync(self):
+		NodesManager.use_closure_index = True
+		try:
+			NodesManager.add_node('Europe')
+			self.assertEqual([], list(NodesManager.get_node('Europe').get_all_descendants_names()))
+			import_file(self.write_jsonl({'name': 'Poland', 'parents': ['Europe']}, {'name': 'Warsaw', 'parents': ['Poland']}))
+
+			self.assertCountEqual(['Poland', 'Warsaw'], NodesManager.get_node('Europe').get_all_descendants_names())
+		finally:
+			NodesManager.use_closure_index = False
+
+	def test_record_without_name(self):
+		with self.assertRaises(ValueError):
+			list(read_records(self.write_jsonl({'parents': ['Europe']})))
+
+	def test_unknown_format(self):
+		with self.assertRaises(ValueError):
+			read_records(self.write_records('.txt', ''))
+
+	def test_import_command(self):
+		lines = []
+		self.cli.set_out_stream(lines.append)
+		try:
+			self.cli.parse(['m', K.IMPORT, str(self.write_jsonl({'name': 'Europe'}, {'name': 'Poland', 'parents': ['Europe']}))])
+		finally:
+			self.cli.set_out_stream(print)
+
+		self.assertEqual(['Imported 2 nodes and 1 edges'], lines)
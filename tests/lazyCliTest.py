@@ -0,0 +1,49 @@
+from abstractCategorierTest import AbstractCategorierTest
+from categorierCli import CategorierCli, Keywords as K
+from nodes import NodesManager
+
+
+class LazyCliTest(AbstractCategorierTest):
+
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Lazy cli'
+
+	def setUp(self) -> None:
+		super().setUp()
+		self.lazy_cli = CategorierCli()
+
+	def test_nothing_is_built_before_parsing(self):
+		self.assertFalse(any(map(self.lazy_cli.root.has_node, (K.ADD, K.SHOW, K.SEARCH, K.CHANGE))))
+
+	def test_only_the_parsed_command_is_built(self):
+		self.lazy_cli.parse(f'm {K.ADD} Poland')
+
+		self.assertTrue(self.lazy_cli.root.has_node(K.ADD))
+		self.assertFalse(self.lazy_cli.root.has_node(K.SEARCH))
+		self.assertTrue(NodesManager.is_in_data('Poland'))
+
+	def test_aliases_share_a_subtree(self):
+		self.lazy_cli.parse(f'm {K.ADD} Europe')
+		self.lazy_cli.parse(f'm {K.ADD} Poland')
+		self.lazy_cli.parse(f'm {K.CAT} Poland Europe')
+		self.lazy_cli.parse(f'm {K.RENAME} Poland Polska')
+
+		self.assertTrue(self.lazy_cli.root.has_node(K.CHANGE))
+		self.assertIn('Europe', NodesManager.get_node('Polska').parents.get_all())
+
+	def test_command_after_flags_is_built(self):
+		self.lazy_cli.parse(f'm {K.ADD} Poland')
+		self.lazy_cli.parse(f'm {K.LIMIT} 1 {K.SEARCH} P')
+
+		self.assertTrue(self.lazy_cli.root.has_node(K.SEARCH))
+
+	def test_command_parsed_from_an_action_is_built(self):
+		self.lazy_cli.parse(f'm {K.ADD} Poland {K.SET} capital Warsaw')
+
+		self.assertEqual('Warsaw', NodesManager.get_node('Poland')['capital'])
+
+	def test_create_all_subtrees(self):
+		self.lazy_cli.create_all_subtrees()
+
+		self.assertTrue(all(map(self.lazy_cli.root.has_node, (K.ADD, K.CATEGORIZE, K.SET, K.UNSET, K.DELETE, K.SHOW, K.SEARCH, K.CHANGE, K.RENAME))))
@@ -160,6 +160,7 @@ class NodeConnectingTest(AbstractCategorierTest):
 	@parameterized.expand([
 		('one', ['p', 'a', 'b', 'c'], [1], ['a', 'b', 'c']),
 		('many', ['p', 'a', 'b', 'c'], [2, 3, 4], ['p']),
+		('unordered', ['p', 'a', 'b', 'c'], [4, 2], ['p', 'b']),
 	])
 	def test_delete_by_number(self, name: str, to_creates: list[str], to_deletes: list[int], e_nodes: list[str]):
 		for to_create in to_creates:
@@ -169,3 +170,27 @@ class NodeConnectingTest(AbstractCategorierTest):
 
 		all_names = list(NodesManager.get_all_names())
 		self.assertCountEqual(e_nodes, all_names)
+
+	def test_delete_connected_nodes(self):
+		NodesManager.add_node('a')
+		NodesManager.add_node('b', parents=['a'])
+		NodesManager.add_node('c', parents=['a', 'b'])
+		NodesManager.add_node('d', parents=['c'])
+		NodesManager.add_node('e', parents=['b'])
+
+		self.cli.parse(f'm {K.DELETE} b c')
+
+		self.assertEqual(['a', 'd', 'e'], list(NodesManager.get_all_names()))
+		self.assertEqual([], NodesManager.get_node('a').children.get_all())
+		self.assertEqual([], NodesManager.get_node('d').parents.get_all())
+		self.assertEqual([], NodesManager.get_node('e').parents.get_all())
+
+	def test_delete_unknown_node_changes_nothing(self):
+		NodesManager.add_node('a')
+		NodesManager.add_node('b', parents=['a'])
+
+		with self.assertRaises(KeyError):
+			NodesManager.delete_nodes('b', 'x')
+
+		self.assertEqual(['a', 'b'], list(NodesManager.get_all_names()))
+		self.assertEqual(['b'], NodesManager.get_node('a').children.get_all())
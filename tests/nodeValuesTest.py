@@ -138,6 +138,7 @@ class NodeValuesTest(AbstractCategorierTest):
 		('unset_by_number', ['Muhhamad', 'Hatimi'], [2], K.UNSET),
 		('delete_value_by_number', ['Muhhamad', 'Hatimi'], [2], f'{K.DEL} {K.VALUE}'),
 		('two_values_by_number', ['Muhhamad'], [2, 3], f'{K.DELETE} {K.VALUES}'),
+		('two_values_by_number_unordered', ['Muhhamad'], [3, 2], K.UNSET),
 	])
 	def test_unset_concrete_value(self, name: str, e_values: list[str], to_unsets: list[str], unset_way: str):
 		node_name = 'n'
@@ -152,3 +153,16 @@ class NodeValuesTest(AbstractCategorierTest):
 		self.assertIn(key, node.keys())
 		for e_val in e_values:
 			self.assertIn(e_val, node[key])
+
+	@parameterized.expand([
+		('one', ['3'], ['ibn', 'Muhhamad', 'Hatimi']),
+		('many', ['1', '3'], ['Muhhamad', 'Hatimi']),
+		('value_and_number', ['Hatimi', '3'], ['ibn', 'Muhhamad']),
+	])
+	def test_unset_duplicate_by_number(self, name: str, to_unsets: list[str], e_values: list[str]):
+		node = NodesManager.add_node('n')
+		node['names'] = ['ibn', 'Muhhamad', 'ibn', 'Hatimi']
+
+		self.cli.parse(f'm {K.UNSET} names {" ".join(to_unsets)} {K.FROM} n')
+
+		self.assertEqual(e_values, list(NodesManager.get_node('n')['names']))
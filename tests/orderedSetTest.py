@@ -0,0 +1,52 @@
+from abstractCategorierTest import AbstractCategorierTest
+from nodes import NodesManager, OrderedSet
+
+
+class OrderedSetTest(AbstractCategorierTest):
+
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Ordered set'
+
+	def test_keeps_insertion_order_without_duplicates(self):
+		values = OrderedSet(['b', 'a'])
+		values.extend(['c', 'a', 'd'])
+
+		self.assertEqual(['b', 'a', 'c', 'd'], list(values))
+		self.assertEqual(['d', 'c', 'a', 'b'], list(reversed(values)))
+
+	def test_indexing_follows_changes(self):
+		values = OrderedSet(['a', 'b', 'c'])
+		self.assertEqual('b', values[1])
+
+		values.remove('a')
+		values.add('d')
+
+		self.assertEqual('c', values[1])
+		self.assertEqual(['c', 'd'], values[1:])
+		self.assertEqual(3, len(values))
+
+	def test_membership_and_removal(self):
+		values = OrderedSet(['a', 'b'])
+		values.remove('a')
+
+		self.assertNotIn('a', values)
+		self.assertIn('b', values)
+		with self.assertRaises(ValueError):
+			values.remove('a')
+
+	def test_equals_sequences(self):
+		self.assertEqual(OrderedSet(['a', 'b']), ['a', 'b'])
+		self.assertNotEqual(OrderedSet(['a', 'b']), ('b', 'a'))
+
+	def test_members_of_large_category(self):
+		NodesManager.add_node('Europe')
+		names = [f'Country {i}' for i in range(1000)]
+		NodesManager.add_nodes(*names, all_parents=[['Europe']] * len(names))
+		for name in names[::2]:
+			NodesManager.get_node(name).remove_parents('Europe')
+
+		children = NodesManager.get_node('Europe').children
+		self.assertEqual(names[1::2], children.get_all())
+		self.assertEqual('Country 3', children[1].name)
+		self.assertNotIn('Country 2', children)
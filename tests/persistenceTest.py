@@ -0,0 +1,157 @@
+from datetime import date
+
+from parameterized import parameterized
+
+from abstractCategorierTest import AbstractCategorierTest
+from categorierCli import Keywords as K
+from nodes import NodesManager
+from storage import Journal, SnapshotCache, YamlBackend
+
+
+class PersistenceTest(AbstractCategorierTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Persistence'
+
+	@property
+	def journal_path(self):
+		return Journal(self.test_path).path
+
+	@parameterized.expand([
+		('add', f'{K.ADD} n', {'p': {}, 'n': {}}),
+		('set', f'{K.SET} key value {K.IN} p', {'p': {'key': 'value'}}),
+		('categorize', f'{K.ADD} n p', {'p': {'children': ['n']}, 'n': {'parents': ['p']}}),
+		('delete', f'{K.DELETE} p', {}),
+	])
+	def test_journal_replay(self, name: str, command: str, e_data: dict):
+		NodesManager.add_node('p')
+		NodesManager.save_data()
+
+		self.cli.parse(f'm {command}')
+		NodesManager.save_data()
+		NodesManager.load_data(self.test_path)
+
+		self.assertEqual(e_data, NodesManager.get_data())
+		self.assertEqual(list(e_data), list(NodesManager.get_all_names()))
+
+	def test_save_appends_without_rewriting_snapshot(self):
+		NodesManager.add_nodes('n1', 'n2')
+		NodesManager.save_data()
+
+		self.assertEqual(0, self.test_path.stat().st_size)
+		self.assertTrue(self.journal_path.exists())
+
+	def test_compaction_on_threshold(self):
+		threshold = YamlBackend.journal_compaction_threshold
+		YamlBackend.journal_compaction_threshold = 3
+		try:
+			for name in ('n1', 'n2', 'n3'):
+				NodesManager.add_node(name)
+				NodesManager.save_data()
+		finally:
+			YamlBackend.journal_compaction_threshold = threshold
+
+		self.assertFalse(self.journal_path.exists())
+		NodesManager.load_data(self.test_path)
+		self.assertEqual(['n1', 'n2', 'n3'], list(NodesManager.get_all_names()))
+
+	def test_torn_journal_tail_is_dropped(self):
+		NodesManager.add_node('n')
+		NodesManager.save_data()
+		with open(self.journal_path, 'a') as journal_file:
+			journal_file.write('{"op": "put", "na')
+
+		NodesManager.load_data(self.test_path)
+		NodesManager.add_node('m')
+		NodesManager.save_data()
+		NodesManager.load_data(self.test_path)
+
+		self.assertEqual(['n', 'm'], list(NodesManager.get_all_names()))
+
+	def test_dates_are_saved(self):
+		self.test_path.write_text('Poland:\n  independence: 1918-11-11\n', encoding='utf-8')
+		NodesManager.load_data(self.test_path)
+
+		NodesManager.get_node('Poland')['capital'] = 'Warsaw'
+		NodesManager.save_data()
+		NodesManager.load_data(self.test_path)
+
+		self.assertEqual({'Poland': {'independence': date(1918, 11, 11), 'capital': 'Warsaw'}}, NodesManager.get_data())
+
+	def test_snapshot_cache_is_used_when_fresh(self):
+		NodesManager.add_node('p')
+		NodesManager.add_node('n', parents=['p'])
+		NodesManager.compact_data()
+		cache_path = SnapshotCache(self.test_path).path
+		self.assertTrue(cache_path.exists())
+
+		NodesManager.load_data(self.test_path)
+
+		self.assertEqual({'p': {'children': ['n']}, 'n': {'parents': ['p']}}, NodesManager.get_data())
+
+	def test_snapshot_cache_keeps_what_json_cannot(self):
+		self.test_path.write_text('Poland:\n  independence: 1918-11-11\n1918:\n  2: Poland\n', encoding='utf-8')
+
+		for _ in range(2):
+			NodesManager.load_data(self.test_path)
+			self.assertEqual({'Poland': {'independence': date(1918, 11, 11)}, 1918: {2: 'Poland'}}, NodesManager.get_data())
+
+	def test_snapshot_cache_is_ignored_when_stale(self):
+		NodesManager.add_node('n')
+		NodesManager.compact_data()
+
+		with open(self.test_path, 'a') as data_file:
+			data_file.write('m: {}\n')
+		NodesManager.load_data(self.test_path)
+
+		self.assertEqual(['n', 'm'], list(NodesManager.get_all_names()))
+
+	@parameterized.expand([
+		('show_all', f'{K.SHOW}'),
+		('show_node', f'{K.SHOW} n'),
+		('search', f'{K.SEARCH} n'),
+		('search_by_value', f'{K.SEARCH} {K.BY} key value'),
+	])
+	def test_read_only_commands_do_not_write(self, name: str, command: str):
+		NodesManager.add_node('p')
+		NodesManager.add_node('n', parents=['p'])
+		NodesManager.save_data()
+		NodesManager.load_data(self.test_path)
+		journal_size = self.journal_path.stat().st_size
+
+		self.cli.set_out_stream(lambda *args, **kwargs: None)
+		self.cli.parse(f'm {command}')
+
+		self.assertFalse(NodesManager.has_changes())
+		NodesManager.save_data()
+		self.assertEqual(journal_size, self.journal_path.stat().st_size)
+
+	@parameterized.expand([
+		('add_description', f'{K.ADD} {K.DESCR} d2 {K.TO} n', {'descriptions': ['d1', 'd2'], 'key': ['v1', 'v2']}),
+		('add_values', f'{K.ADD} {K.VALUES} key v3 {K.TO} n', {'descriptions': ['d1'], 'key': ['v1', 'v2', 'v3']}),
+		('unset_by_number', f'{K.UNSET} key 1 {K.FROM} n', {'descriptions': ['d1'], 'key': ['v2']}),
+		('delete_description', f'{K.DELETE} {K.DESCR} 1 {K.FROM} n', {'key': ['v1', 'v2']}),
+	])
+	def test_in_place_edits_are_saved(self, name: str, command: str, e_data: dict):
+		NodesManager.add_node('n', descriptions=['d1'])
+		NodesManager.get_node('n')['key'] = ['v1', 'v2']
+		NodesManager.save_data()
+		NodesManager.load_data(self.test_path)
+
+		self.cli.parse(f'm {command}')
+		NodesManager.save_data()
+		NodesManager.load_data(self.test_path)
+
+		self.assertEqual({'n': e_data}, NodesManager.get_data())
+
+	def test_bulk_edges_are_flushed_once(self):
+		children = [f'c{i}' for i in range(200)]
+		NodesManager.add_node('p')
+		NodesManager.add_nodes(*children, all_parents=[['p']] * len(children))
+
+		self.assertEqual(['p', *children], list(NodesManager.get_all_names()))
+		NodesManager.save_data()
+		NodesManager.load_data(self.test_path)
+
+		self.assertEqual(children, NodesManager.get_node('p').children.names)
+		self.assertTrue(all(NodesManager.get_node(child).parents.names == ['p'] for child in children))
@@ -0,0 +1,119 @@
+import re
+
+from parameterized import parameterized
+from smartcli.nodes.smartList import SmartList
+
+import searchTest
+from abstractCategorierTest import AbstractCategorierTest
+from categorierCli import Keywords as K
+from graphIndexTest import IndexedTestMixin
+from nodes import NodesManager
+from search import Predicate, QueryPlanner
+
+
+class QueryPlannerTest(IndexedTestMixin, AbstractCategorierTest):
+	index_switches = ('use_attribute_index', )
+
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Query Planner'
+
+	def setUp(self) -> None:
+		super().setUp()
+		countries = [f'c{i}' for i in range(40)]
+		NodesManager.add_nodes(*countries)
+		for i, country in enumerate(countries):
+			node = NodesManager.get_node(country)
+			node.put('continent', 'Europe' if i % 2 else 'America')
+			node.put('code', f'x{i}')
+			if not i % 10:
+				node.put('capital', 'yes')
+
+	def plan(self, func, *predicates: Predicate):
+		NodesManager.get_data()
+		return QueryPlanner(NodesManager.get_attribute_index()).plan(predicates, func)
+
+	def test_most_selective_is_looked_up_first(self):
+		broad = Predicate('continent', re.compile('^Europe$'))
+		narrow = Predicate('capital', re.compile('^yes$'))
+
+		plan = self.plan(all, broad, narrow)
+
+		self.assertEqual([narrow, broad], plan.lookups + plan.checks)
+
+	def test_unselective_criterion_is_checked_on_candidates(self):
+		narrow = Predicate('code', re.compile('^x7$'))
+		broad = Predicate('continent', re.compile('r'))
+
+		plan = self.plan(all, broad, narrow)
+
+		self.assertEqual([narrow], plan.lookups)
+		self.assertEqual([broad], plan.checks)
+		self.assertEqual(['c7'], [node.name for node in NodesManager.search_node(['continent', 'code'], ['r', '^x7$'], all)])
+
+	def test_union_looks_everything_up(self):
+		plan = self.plan(any, Predicate('code', re.compile('^x7$')), Predicate('capital', re.compile('yes')))
+
+		self.assertEqual(2, len(plan.lookups))
+		self.assertEqual([], plan.checks)
+
+	def test_scan_without_searcher_checks_unset_keys_first(self):
+		unset = Predicate('capital', None)
+		matched = Predicate('continent', re.compile('Eu'))
+
+		plan = QueryPlanner().plan([matched, unset], all)
+
+		self.assertEqual([], plan.lookups)
+		self.assertEqual([unset, matched], plan.checks)
+
+	@parameterized.expand([
+		('and', ['continent', 'capital'], ['Europe', 'yes'], all),
+		('or', ['code', 'capital'], ['^x1', 'yes'], any),
+		('unset', ['capital', 'continent'], ['none', 'America'], all),
+		('memo', ['memo', 'code'], ['c1', '5$'], all),
+	])
+	def test_plans_match_scan(self, name: str, criteria: list[str], arguments: list[str], func):
+		indexed = [node.name for node in NodesManager.search_node(criteria, arguments, func)]
+		NodesManager.use_attribute_index = False
+		scanned = [node.name for node in NodesManager.search_node(criteria, arguments, func)]
+
+		self.assertEqual(scanned, indexed)
+
+	def test_explain(self):
+		lines = SmartList()
+		self.cli.set_out_stream(lines.__iadd__)
+		self.cli.parse(f'm {K.SEARCH} {K.BY} continent Europe and capital yes {K.EXPLAIN}')
+
+		self.assertEqual(2, len(lines))
+		self.assertTrue(lines[0].startswith("1) look up capital matches 'yes'"))
+		self.assertEqual("2) check each candidate: continent matches 'Europe'", lines[1])
+
+
+class ParallelSearchTest(searchTest.SearchTest):
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Parallel Search'
+
+	def setUp(self) -> None:
+		super().setUp()
+		NodesManager.use_parallel_search = True
+		NodesManager.parallel_search_threshold = 0
+		NodesManager.parallel_search_workers = 2
+
+	def tearDown(self) -> None:
+		NodesManager.use_parallel_search = False
+		NodesManager.parallel_search_threshold = 100_000
+		NodesManager.parallel_search_workers = None
+		super().tearDown()
+
+	def test_matches_serial_order(self):
+		names = [f'n{i}' for i in range(50)]
+		NodesManager.add_nodes(*names)
+		for i, name in enumerate(names):
+			NodesManager.get_node(name).put('parity', 'odd' if i % 2 else 'even')
+
+		parallel = [node.name for node in NodesManager.search_node(['parity', 'memo'], ['odd', '[05]$'], all)]
+		serial = [node.name for node in NodesManager.search_node(['parity', 'memo'], ['odd', '[05]$'], all, parallel=False)]
+
+		self.assertEqual(serial, parallel)
+		self.assertEqual(['n5', 'n15', 'n25', 'n35', 'n45'], parallel)
@@ -1,10 +1,12 @@
 from itertools import chain, repeat
+from unittest.mock import patch
 
 from parameterized import parameterized
 from smartcli.nodes.smartList import SmartList
 
 from abstractCategorierTest import AbstractCategorierTest
 from categorierCli import Keywords as K
+from indexes import Listing
 from nodes import NodesManager
 
 
@@ -40,8 +42,132 @@ class SearchTest(AbstractCategorierTest):
 			self.assertIn(name, e_results)
 			self.assertIn(str(i+1), prefix)
 
+	@parameterized.expand([
+		('by_list_element', ['Poland', 'Czechia'], 'Slavic', f'{K.BY} languages'),
+		('by_anchored_list_element', ['Portugal', 'Peru', 'Chile'], '^Romance$', f'{K.BY} languages'),
+		('by_description', ['Chile'], 'Andes', f'{K.BY} {K.DESCRIPTIONS}'),
+		('by_description_prefix', ['Peru', 'Chile'], '^And', f'{K.BY} {K.DESCRIPTIONS}'),
+	])
+	def test_search_list_values(self, name: str, e_results: list[str], to_search: str, search_by: str):
+		countries = 'Poland', 'Portugal', 'Czechia', 'Peru', 'Colombia', 'Chile'
+		all_languages = ['Slavic', 'Baltic'], ['Romance'], ['Slavic'], ['Romance', 'Quechuan'], [], ['Romance']
+		NodesManager.add_nodes(*countries)
+		for country, languages in zip(countries, all_languages):
+			NodesManager.get_node(country)['languages'] = languages
+		NodesManager.get_node('Peru').descriptions.extend(['Andean country', 'Pacific coast'])
+		NodesManager.get_node('Chile').descriptions.append('Andes')
+
+		lines = SmartList()
+		self.cli.set_out_stream(lines.__iadd__)
+		self.cli.parse(f'm {K.SEARCH} {to_search} {search_by}')
+		self.assertCountEqual(e_results, [line.split(' ')[1] for line in lines])
+
+	@parameterized.expand([
+		('limit', f'{K.LIMIT} 2', ['1) Poland', '2) Portugal']),
+		('limit_one', f'{K.LIMIT} 1', ['1) Poland']),
+		('offset', f'{K.OFFSET} 2', ['3) Peru']),
+		('offset_and_limit', f'{K.OFFSET} 1 {K.LIMIT} 1', ['2) Portugal']),
+	])
+	def test_search_page(self, name: str, page: str, e_lines: list[str]):
+		countries = 'Poland', 'Portugal', 'Czechia', 'Peru', 'Colombia', 'Chile'
+		NodesManager.add_nodes(*countries)
+
+		lines = SmartList()
+		self.cli.set_out_stream(lines.__iadd__)
+		self.cli.parse(f'm {K.SEARCH} P {page}')
+		self.assertEqual(e_lines, list(lines))
+
+	def test_node_named_first(self):
+		self.cli.parse(f'm {K.ADD} first')
+
+		lines = SmartList()
+		self.cli.set_out_stream(lines.__iadd__)
+		self.cli.parse(f'm {K.SHOW} first')
+		self.assertEqual(['first'], list(NodesManager.get_all_names()))
+		self.assertIn('Name: first', lines)
+
+	def test_show_page_numbers_address_deletion(self):
+		countries = 'Poland', 'Portugal', 'Czechia', 'Peru', 'Colombia', 'Chile'
+		NodesManager.add_nodes(*countries)
+
+		lines = SmartList()
+		self.cli.set_out_stream(lines.__iadd__)
+		self.cli.parse(f'm {K.SHOW} {K.OFFSET} 2 {K.LIMIT} 2')
+		self.assertEqual(['3) Czechia', '4) Peru'], list(lines))
+
+		self.cli.parse(f'm {K.DELETE} 4')
+		self.assertNotIn('Peru', list(NodesManager.get_all_names()))
+
+	def test_search_numbers_address_deletion(self):
+		countries = 'Poland', 'Portugal', 'Czechia', 'Peru', 'Colombia', 'Chile'
+		NodesManager.add_nodes(*countries)
+
+		lines = SmartList()
+		self.cli.set_out_stream(lines.__iadd__)
+		self.cli.parse(f'm {K.SEARCH} P')
+		self.assertEqual(['1) Poland', '2) Portugal', '3) Peru'], list(lines))
+
+		self.cli.parse(f'm {K.DELETE} 3')
+		self.assertEqual(['Poland', 'Portugal', 'Czechia', 'Colombia', 'Chile'], list(NodesManager.get_all_names()))
+
+	def test_numbers_survive_deletion(self):
+		countries = 'Poland', 'Portugal', 'Czechia', 'Peru', 'Colombia', 'Chile'
+		NodesManager.add_nodes(*countries)
+		self.cli.parse(f'm {K.SHOW}')
+
+		self.cli.parse(f'm {K.DELETE} 2')
+		self.cli.parse(f'm {K.DELETE} 4')
+		self.assertEqual(['Poland', 'Czechia', 'Colombia', 'Chile'], list(NodesManager.get_all_names()))
+
+		with self.assertRaises(KeyError):
+			self.cli.parse(f'm {K.DELETE} 2')
+
+	def test_number_outside_listing_is_rejected(self):
+		countries = 'Poland', 'Portugal', 'Czechia', 'Peru', 'Colombia', 'Chile'
+		NodesManager.add_nodes(*countries)
+		self.cli.parse(f'm {K.SEARCH} P')
+
+		with self.assertRaises(KeyError):
+			self.cli.parse(f'm {K.DELETE} 5')
+		self.assertEqual(list(countries), list(NodesManager.get_all_names()))
+
+	def test_listing_is_saved_with_data(self):
+		countries = 'Poland', 'Portugal', 'Czechia', 'Peru', 'Colombia', 'Chile'
+		NodesManager.add_nodes(*countries)
+		self.cli.parse(f'm {K.SEARCH} P')
+		NodesManager.save_data()
+
+		NodesManager.load_data(self.test_path)
+		self.cli.parse(f'm {K.DELETE} 3')
+
+		self.assertEqual(['Poland', 'Portugal', 'Czechia', 'Colombia', 'Chile'], list(NodesManager.get_all_names()))
+
+	def test_same_listing_is_not_saved_again(self):
+		NodesManager.add_nodes('Poland', 'Portugal', 'Peru')
+		self.cli.parse(f'm {K.SEARCH} P')
+		NodesManager.save_data()
+
+		NodesManager.load_data(self.test_path)
+		self.cli.parse(f'm {K.SEARCH} P')
+		with patch('storage.os.replace') as replace:
+			NodesManager.save_data()
+
+		replace.assert_not_called()
+
+	def test_long_listing_bars_its_numbers(self):
+		countries = 'Poland', 'Portugal', 'Czechia', 'Peru', 'Colombia', 'Chile'
+		NodesManager.add_nodes(*countries)
+		with patch.object(Listing, 'kept_size', 5):
+			self.cli.parse(f'm {K.SHOW}')
+			NodesManager.save_data()
+
+			NodesManager.load_data(self.test_path)
+			with self.assertRaises(KeyError):
+				self.cli.parse(f'm {K.DELETE} 2')
+			self.cli.parse(f'm {K.SHOW} {K.LIMIT} 5')
+			self.cli.parse(f'm {K.DELETE} 2')
 
-	#TODO: write a test for list values
+		self.assertEqual(['Poland', 'Czechia', 'Peru', 'Colombia', 'Chile'], list(NodesManager.get_all_names()))
 
 	@parameterized.expand([
 		('all_default', '', ['Poland', 'Portugal', 'Czechia', 'Peru', 'Colombia', 'Chile']),
@@ -0,0 +1,66 @@
+from parameterized import parameterized
+
+from abstractCategorierTest import AbstractCategorierTest
+from categorierCli import Keywords as K
+from nodes import NodesManager, Paths
+import searchTest
+
+
+class SqliteStorageTest(AbstractCategorierTest):
+	test_path = Paths.RESOURCES / 'test_data.db'
+
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Sqlite Storage'
+
+	@parameterized.expand([
+		('add', f'{K.ADD} n', {'p': {}, 'n': {}}),
+		('set', f'{K.SET} key value {K.IN} p', {'p': {'key': 'value'}}),
+		('add_values', f'{K.ADD} {K.VALUES} key v1 v2 {K.TO} p', {'p': {'key': ['v1', 'v2']}}),
+		('categorize', f'{K.ADD} n p', {'p': {'children': ['n']}, 'n': {'parents': ['p']}}),
+		('delete', f'{K.DELETE} p', {}),
+	])
+	def test_reload(self, name: str, command: str, e_data: dict):
+		NodesManager.add_node('p')
+		NodesManager.save_data()
+
+		self.cli.parse(f'm {command}')
+		NodesManager.save_data()
+		NodesManager.load_data(self.test_path)
+
+		self.assertEqual(e_data, dict(NodesManager.get_data().items()))
+		self.assertEqual(list(e_data), list(NodesManager.get_all_names()))
+
+	def test_recreated_node_moves_to_the_end(self):
+		NodesManager.add_nodes('n1', 'n2')
+		NodesManager.save_data()
+
+		NodesManager.delete_node('n1')
+		NodesManager.add_node('n1')
+		NodesManager.save_data()
+		NodesManager.load_data(self.test_path)
+
+		self.assertEqual(['n2', 'n1'], list(NodesManager.get_all_names()))
+
+	@parameterized.expand([
+		('saved', True),
+		('unsaved', False),
+	])
+	def test_search_sees_pending_changes(self, name: str, save: bool):
+		NodesManager.add_nodes('Poland', 'Peru')
+		NodesManager.get_node('Poland').put('continent', 'Europe')
+		if save:
+			NodesManager.save_data()
+		NodesManager.get_node('Peru').put('continent', 'America')
+
+		found = NodesManager.search_node(['continent'], ['Europe|America'])
+
+		self.assertEqual(['Poland', 'Peru'], [node.name for node in found])
+
+
+class SqliteSearchTest(searchTest.SearchTest):
+	test_path = Paths.RESOURCES / 'test_data.db'
+
+	@classmethod
+	def _get_test_name(cls) -> str:
+		return 'Sqlite Search'